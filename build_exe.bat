@@ -35,6 +35,13 @@ if exist "dist" (
     rmdir /s /q dist
 )
 
+REM 編譯 UI 翻譯檔（JSON -> Python 模組 + .pyc，加快啟動時載入）
+echo 編譯 UI 翻譯檔...
+python tools\compile_translations.py
+if errorlevel 1 (
+    echo 警告: 翻譯檔編譯失敗，執行時將改為解析 JSON
+)
+
 echo.
 echo ========================================
 echo 開始執行 PyInstaller...
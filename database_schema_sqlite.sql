@@ -69,9 +69,8 @@ CREATE INDEX IF NOT EXISTS idx_timeseries_segment_time
 CREATE INDEX IF NOT EXISTS idx_timeseries_signal
     ON timeseries_data(signal_name);
 
--- 複合索引：訊號 + 時間
-CREATE INDEX IF NOT EXISTS idx_timeseries_signal_time
-    ON timeseries_data(segment_id, signal_name, time_ns);
+-- 覆蓋索引 idx_timeseries_signal_time_value（訊號 + 時間 + 數值）由
+-- SQLiteManager._migrate_database 建立：既有資料庫需一次性重建索引，會記錄進度
 
 -- ============================================================================
 -- 4. CAN Messages 表：原始 CAN 訊息
@@ -142,6 +141,8 @@ CREATE TABLE IF NOT EXISTS cereal_signal_definitions (
     unit_cn TEXT,
     name_cn TEXT,
     description_cn TEXT,
+    -- 訊號管理對話框的「隱藏 DEPRECATED」篩選用（舊資料庫由 _migrate_database 補上）
+    is_deprecated INTEGER GENERATED ALWAYS AS (full_name LIKE '%DEPRECATED%') VIRTUAL,
 
     UNIQUE(message_type, signal_name)
 );
@@ -149,6 +150,14 @@ CREATE TABLE IF NOT EXISTS cereal_signal_definitions (
 CREATE INDEX IF NOT EXISTS idx_cereal_full_name
     ON cereal_signal_definitions(full_name);
 
+-- 訊號管理對話框依 message_type, full_name 排序列出，不需額外排序
+CREATE INDEX IF NOT EXISTS idx_cereal_msgtype_name
+    ON cereal_signal_definitions(message_type, full_name);
+
+-- 覆蓋索引：依 full_name 查詢單位時不需回表
+CREATE INDEX IF NOT EXISTS idx_cereal_full_name_unit
+    ON cereal_signal_definitions(full_name, unit, unit_cn);
+
 -- ============================================================================
 -- 7. CAN Signal Definitions 表：CAN 訊號定義
 -- ============================================================================
@@ -184,6 +193,10 @@ CREATE INDEX IF NOT EXISTS idx_can_def_full_name
 CREATE INDEX IF NOT EXISTS idx_can_def_can_id
     ON can_signal_definitions(can_id);
 
+-- 覆蓋索引：依 full_name 查詢單位時不需回表
+CREATE INDEX IF NOT EXISTS idx_can_def_full_name_unit
+    ON can_signal_definitions(full_name, unit, unit_cn);
+
 -- ============================================================================
 -- 8. Custom Signals 表：自訂計算訊號
 -- ============================================================================
@@ -199,6 +212,10 @@ CREATE TABLE IF NOT EXISTS custom_signals (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- 覆蓋索引：依 signal_name 查詢單位時不需回表
+CREATE INDEX IF NOT EXISTS idx_custom_signals_name_unit
+    ON custom_signals(signal_name, unit, unit_cn);
+
 -- ============================================================================
 -- 8.5. Video Frame Timestamps 表：影片幀時間戳記
 -- ============================================================================
@@ -267,6 +284,16 @@ SELECT
     s.created_at
 FROM segments s;
 
+-- ============================================================================
+-- 視圖：所有訊號的單位（Cereal > CAN > 自訂訊號，priority 越小越優先）
+-- ============================================================================
+CREATE VIEW IF NOT EXISTS signal_units_all AS
+SELECT full_name, unit, unit_cn, 1 AS priority FROM cereal_signal_definitions
+UNION ALL
+SELECT full_name, unit, unit_cn, 2 AS priority FROM can_signal_definitions
+UNION ALL
+SELECT signal_name AS full_name, unit, unit_cn, 3 AS priority FROM custom_signals;
+
 -- ============================================================================
 -- 應用程式版本資訊
 -- ============================================================================
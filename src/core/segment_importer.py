@@ -582,7 +582,8 @@ class SegmentImporter:
             self._log(t("Optimizing database performance settings..."))
             cursor_perf = self.db_manager.conn.cursor()
             cursor_perf.execute("PRAGMA synchronous = OFF")  # Disable synchronous writes
-            cursor_perf.execute("PRAGMA journal_mode = MEMORY")  # Use memory journal
+            # Journal stays in WAL mode so the read-only connection can keep serving
+            # UI queries during import (leaving WAL would fail while it is open)
             cursor_perf.execute("PRAGMA temp_store = MEMORY")  # Store temporary data in memory
             cursor_perf.execute("PRAGMA cache_size = -128000")  # 128MB cache
             cursor_perf.close()
@@ -859,7 +860,6 @@ class SegmentImporter:
             self._log(t("Restoring database settings..."))
             cursor_restore = self.db_manager.conn.cursor()
             cursor_restore.execute("PRAGMA synchronous = NORMAL")
-            cursor_restore.execute("PRAGMA journal_mode = WAL")
             cursor_restore.close()
 
             self._progress(100)
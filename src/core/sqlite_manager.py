@@ -2,8 +2,13 @@
 SQLite Database Manager for openpilot logs
 Handles connection and operations with SQLite database
 """
+import re
+import json
+import time
 import sqlite3
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional, Any
 from contextlib import contextmanager
@@ -11,10 +16,113 @@ from .signal_calculator import SignalCalculator
 
 logger = logging.getLogger(__name__)
 
+# 自動創建訊號定義時用於推測資料類型的規則（依序比對，第一個符合者生效）
+_DATA_TYPE_RULES = [
+    (re.compile(r'type|state|mode|name|ecu|event|index|count|id|frame'), 'Int32'),  # 枚舉/計數類型
+    (re.compile(r'bool|pressed|active|valid|enabled|detected'), 'Bool'),
+]
+
+# 自動創建訊號定義時用於推測單位的規則（依序比對，第一個符合者生效）
+_UNIT_RULES = [
+    (re.compile(r'speed|velocity'), ('m/s', '公尺/秒')),
+    (re.compile(r'accel'), ('m/s²', '公尺/秒²')),
+    (re.compile(r'^(?=.*angle)(?=.*deg)'), ('deg', '度')),
+    (re.compile(r'^(?=.*rate)(?=.*(?:deg|yaw|pitch))'), ('deg/s', '度/秒')),
+    (re.compile(r'distance|drel|wheelbase'), ('m', '公尺')),
+    (re.compile(r'torque'), ('Nm', '牛頓·公尺')),
+    (re.compile(r'temp'), ('°C', '攝氏度')),
+    (re.compile(r'percent'), ('%', '%')),
+    (re.compile(r'voltage'), ('V', '伏特')),
+    (re.compile(r'current'), ('A', '安培')),
+    (re.compile(r'power'), ('W', '瓦特')),
+    (re.compile(r'^(?=.*time)(?=.*(?:ms|milli))'), ('ms', '毫秒')),
+    (re.compile(r'time'), ('s', '秒')),
+    (re.compile(r'rpm'), ('rpm', '轉/分')),
+]
+
+
+def _infer_data_type(lower_name: str) -> str:
+    """根據（小寫）訊號名稱推測資料類型，預設為浮點數"""
+    for pattern, data_type in _DATA_TYPE_RULES:
+        if pattern.search(lower_name):
+            return data_type
+    return 'Float32'
+
+
+def _infer_unit(lower_name: str) -> Tuple[str, str]:
+    """根據（小寫）訊號名稱推測單位 (英文, 中文)，無法推測時回傳空字串"""
+    for pattern, unit in _UNIT_RULES:
+        if pattern.search(lower_name):
+            return unit
+    return '', ''
+
 
 class SQLiteManager:
     """SQLite database manager"""
 
+    # Size of sqlite3's per-connection prepared statement cache (default is 100)
+    STATEMENT_CACHE_SIZE = 512
+
+    # Maximum number of cached get_signal_unit() results
+    SIGNAL_UNIT_CACHE_SIZE = 4096
+
+    # Maximum number of cached get_segment_by_id() / get_segment_meta() results (LRU)
+    SEGMENT_CACHE_SIZE = 1024
+
+    # Column order of log message query results
+    LOG_MESSAGE_COLUMNS = ('time_ns', 'log_type', 'daemon', 'levelnum', 'filename',
+                           'funcname', 'lineno', 'message', 'dongle_id', 'version',
+                           'branch', 'commit')
+
+    # Covering index for timeseries reads; created by _migrate_database (not the
+    # schema script) so the one-time build on existing databases is logged
+    TIMESERIES_COVERING_INDEX = 'idx_timeseries_signal_time_value'
+    _TIMESERIES_COVERING_INDEX_SQL = """
+        CREATE INDEX IF NOT EXISTS idx_timeseries_signal_time_value
+        ON timeseries_data(segment_id, signal_name, time_ns, value)
+    """
+
+    # Timeseries queries take the signal names as one JSON array parameter so
+    # the SQL text is constant (statement cache always hits). json_each drives
+    # the join, so each signal is read as a range of the covering index
+    # idx_timeseries_signal_time_value (segment_id, signal_name, time_ns, value):
+    # O(log N + k) per signal, never a table scan. Used for unlimited queries;
+    # row-limited queries use _SIGNAL_TIMESERIES_SQL per signal.
+    _TIMESERIES_SQL = """
+        SELECT t.signal_name, t.time_ns, t.value
+        FROM json_each(?) AS j
+        CROSS JOIN timeseries_data AS t
+        WHERE t.segment_id = ?
+          AND t.signal_name = j.value
+          AND t.time_ns BETWEEN ? AND ?
+        ORDER BY t.time_ns
+    """
+
+    # Single-signal form of _TIMESERIES_SQL: one index range is already in time
+    # order, so there is no temp B-tree sort and rows come back as
+    # (time_ns, value) ready to return. The row limit is bound last (-1 = no limit)
+    _SIGNAL_TIMESERIES_SQL = """
+        SELECT time_ns, value
+        FROM timeseries_data
+        WHERE segment_id = ?
+          AND signal_name = ?
+          AND time_ns BETWEEN ? AND ?
+        ORDER BY time_ns
+        LIMIT ?
+    """
+
+    # Chart metadata of one segment: segment and route times plus the data
+    # time range (two lookups on idx_timeseries_segment_time, not a scan)
+    _SEGMENT_META_SQL = """
+        SELECT
+            s.start_time_ns, s.end_time_ns, s.segment_number, r.start_timestamp,
+            (SELECT MIN(time_ns) FROM timeseries_data WHERE segment_id = s.segment_id),
+            (SELECT MAX(time_ns) FROM timeseries_data WHERE segment_id = s.segment_id)
+        FROM segments s
+        LEFT JOIN routes r ON r.route_id = s.route_id
+        WHERE s.segment_id = ?
+    """
+
     def __init__(self, db_path: str = None):
         """
         Initialize SQLite manager
@@ -33,13 +141,24 @@ class SQLiteManager:
         self.conn = None
         self.cursor = None  # Add cursor attribute for compatibility
         self.signal_calculator = None
+        self._read_conn = None  # Lazily opened read-only connection (WAL concurrent reads)
+        # Query result caches, cleared whenever the committed database changes.
+        # Shared with worker threads (e.g. the export worker), so validation,
+        # lookups and inserts hold _cache_lock
+        self._cache_lock = threading.Lock()
+        self._cache_data_version = None
+        self._signal_unit_cache: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._segment_cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._segment_meta_cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._defined_signals_cache: Optional[Dict[str, Dict]] = None
 
     def connect(self):
         """Connect to database"""
         try:
             self.conn = sqlite3.connect(
                 str(self.db_path),
-                check_same_thread=False  # Allow multi-threaded access
+                check_same_thread=False,  # Allow multi-threaded access
+                cached_statements=self.STATEMENT_CACHE_SIZE
             )
             # Enable foreign key constraints
             self.conn.execute("PRAGMA foreign_keys = ON")
@@ -72,10 +191,18 @@ class SQLiteManager:
 
     def disconnect(self):
         """Disconnect from database"""
+        if self._read_conn:
+            self._read_conn.close()
+            self._read_conn = None
         if self.cursor:
             self.cursor.close()
             self.cursor = None
         if self.conn:
+            # Refresh planner statistics so timeseries queries pick the covering index
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
             self.conn.close()
             self.conn = None
             logger.info("Disconnected from database")
@@ -103,6 +230,68 @@ class SQLiteManager:
         finally:
             cur.close()
 
+    def _get_read_conn(self):
+        """Get read-only connection, opening it on first use
+
+        In WAL mode a separate connection can read the last committed state
+        while the main connection holds a write transaction (e.g. during
+        segment import). Falls back to the main connection if it can't be
+        opened.
+        """
+        if self._read_conn is None:
+            try:
+                self._read_conn = sqlite3.connect(
+                    f"{self.db_path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                    cached_statements=self.STATEMENT_CACHE_SIZE
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to open read-only connection, using main connection: {e}")
+                return self.conn
+        return self._read_conn
+
+    @contextmanager
+    def _get_read_cursor(self):
+        """Get read-only cursor with context manager (no commit/rollback)"""
+        cur = self._get_read_conn().cursor()
+        try:
+            yield cur
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            raise
+        finally:
+            cur.close()
+
+    def _validate_caches(self) -> bool:
+        """Clear query result caches if the database changed since they were filled
+
+        Uses PRAGMA data_version on the read-only connection, which changes
+        whenever another connection (including self.conn, e.g. direct writes
+        from dialogs or the importer) commits.
+
+        Returns:
+            True if results may be cached, False if changes can't be detected
+        """
+        conn = self._get_read_conn()
+        if conn is None or conn is self.conn:
+            # data_version doesn't reflect a connection's own commits
+            return False
+
+        try:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return False
+
+        with self._cache_lock:
+            if version != self._cache_data_version:
+                self._signal_unit_cache.clear()
+                self._segment_cache.clear()
+                self._segment_meta_cache.clear()
+                self._defined_signals_cache = None
+                self._cache_data_version = version
+        return True
+
     def _check_and_fix_tables(self):
         """Check and fix table structure (executed on each connection)"""
         try:
@@ -248,8 +437,55 @@ class SQLiteManager:
             logger.error(f"Error creating tables: {e}")
             return False
 
+    def timeseries_index_pending(self) -> bool:
+        """Whether create_tables() will build the covering timeseries index over existing rows"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name=?",
+                           (self.TIMESERIES_COVERING_INDEX,))
+            if cursor.fetchone() is not None:
+                return False
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='timeseries_data'")
+            if cursor.fetchone() is None:
+                return False
+            cursor.execute("SELECT 1 FROM timeseries_data LIMIT 1")
+            return cursor.fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def _ensure_timeseries_covering_index(self, cursor):
+        """Create the covering timeseries index and drop the index it supersedes
+
+        On a database that already holds timeseries data this is a one-time
+        build over the whole table (minutes for large databases). The new
+        index also stores value, so it is larger than the one it replaces,
+        and the old index's pages stay in the file as free pages (reused by
+        later imports, or reclaimed with VACUUM).
+        """
+        pending = self.timeseries_index_pending()
+        if pending:
+            logger.warning(f"Building {self.TIMESERIES_COVERING_INDEX} over existing timeseries data "
+                           f"(one-time upgrade, may take a while)...")
+        start = time.monotonic()
+        cursor.execute(self._TIMESERIES_COVERING_INDEX_SQL)
+        if pending:
+            logger.info(f"Built {self.TIMESERIES_COVERING_INDEX} in {time.monotonic() - start:.1f} s")
+
+        # Superseded by the covering index
+        cursor.execute("DROP INDEX IF EXISTS idx_timeseries_signal_time")
+
     def _migrate_database(self):
         """Database migration: add missing columns"""
+        # Keep routes.total_events in sync with segments via triggers. Own step,
+        # committed before the other migrations, so a failure in one of those
+        # (e.g. generated columns need SQLite 3.31+) can't leave them missing
+        try:
+            self._create_event_count_triggers(self.conn.cursor())
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            logger.error(f"Error creating event count triggers: {e}")
+
         try:
             cursor = self.conn.cursor()
 
@@ -385,6 +621,23 @@ class SQLiteManager:
 
                 logger.info("log_messages table migrated successfully")
 
+            self._ensure_timeseries_covering_index(cursor)
+
+            # Generated DEPRECATED flag, so the signal manager's "hide DEPRECATED"
+            # listing is an index range instead of a LIKE over every full_name
+            # (table_xinfo: generated columns are hidden from table_info)
+            cursor.execute("PRAGMA table_xinfo(cereal_signal_definitions)")
+            if 'is_deprecated' not in {row[1] for row in cursor.fetchall()}:
+                logger.info("Adding generated column to cereal_signal_definitions: is_deprecated")
+                cursor.execute("""
+                    ALTER TABLE cereal_signal_definitions ADD COLUMN is_deprecated INTEGER
+                    GENERATED ALWAYS AS (full_name LIKE '%DEPRECATED%') VIRTUAL
+                """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cereal_deprecated_msgtype_name
+                ON cereal_signal_definitions(is_deprecated, message_type, full_name)
+            """)
+
             self.conn.commit()
             logger.info("Database migration completed")
 
@@ -392,6 +645,61 @@ class SQLiteManager:
             logger.error(f"Error during migration: {e}")
             # Don't interrupt, continue execution
 
+    def _create_event_count_triggers(self, cursor):
+        """Create triggers maintaining routes.total_events incrementally
+
+        On first creation, route totals are recomputed once from segments so
+        that the triggers start from a consistent state.
+        """
+        cursor.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type='trigger' AND name='trg_segments_events_insert'
+        """)
+        if cursor.fetchone() is not None:
+            return
+
+        logger.info("Creating route event count triggers...")
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_segments_events_insert
+            AFTER INSERT ON segments
+            BEGIN
+                UPDATE routes
+                SET total_events = COALESCE(total_events, 0) + COALESCE(NEW.total_events, 0)
+                WHERE route_id = NEW.route_id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_segments_events_update
+            AFTER UPDATE OF total_events ON segments
+            BEGIN
+                UPDATE routes
+                SET total_events = COALESCE(total_events, 0)
+                                   - COALESCE(OLD.total_events, 0)
+                                   + COALESCE(NEW.total_events, 0)
+                WHERE route_id = NEW.route_id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_segments_events_delete
+            AFTER DELETE ON segments
+            BEGIN
+                UPDATE routes
+                SET total_events = COALESCE(total_events, 0) - COALESCE(OLD.total_events, 0)
+                WHERE route_id = OLD.route_id;
+            END
+        """)
+
+        # One-time resync of existing totals
+        cursor.execute("""
+            UPDATE routes
+            SET total_events = (
+                SELECT COALESCE(SUM(total_events), 0)
+                FROM segments
+                WHERE segments.route_id = routes.route_id
+            )
+        """)
+
     # ========================================================================
     # Route Operations
     # ========================================================================
@@ -516,38 +824,24 @@ class SQLiteManager:
                 logger.info(f"Deleting {len(segment_ids)} segments for route {route_id}")
 
                 # Temporarily disable foreign key checks for performance
-                with self.get_cursor() as cur:
-                    cur.execute("PRAGMA foreign_keys = OFF")
-
-                    # Batch delete related data
-                    placeholders = ','.join('?' * len(segment_ids))
-
-                    # Delete timeseries_data
-                    cur.execute(f"DELETE FROM timeseries_data WHERE segment_id IN ({placeholders})", segment_ids)
-                    logger.debug(f"Deleted timeseries_data for {len(segment_ids)} segments")
-
-                    # Delete can_messages
-                    cur.execute(f"DELETE FROM can_messages WHERE segment_id IN ({placeholders})", segment_ids)
-                    logger.debug(f"Deleted can_messages for {len(segment_ids)} segments")
-
-                    # Delete log_messages
-                    cur.execute(f"DELETE FROM log_messages WHERE segment_id IN ({placeholders})", segment_ids)
-                    logger.debug(f"Deleted log_messages for {len(segment_ids)} segments")
-
-                    # Delete video_frame_timestamps
-                    cur.execute(f"DELETE FROM video_frame_timestamps WHERE segment_id IN ({placeholders})", segment_ids)
-                    logger.debug(f"Deleted video_frame_timestamps for {len(segment_ids)} segments")
-
-                    # Delete segments
-                    cur.execute("DELETE FROM segments WHERE route_id = ?", (route_id,))
-                    logger.debug(f"Deleted segments for route {route_id}")
-
-                    # Delete route
-                    cur.execute("DELETE FROM routes WHERE route_id = ?", (route_id,))
-                    logger.debug(f"Deleted route {route_id}")
-
+                # (PRAGMA foreign_keys is a no-op inside a transaction, so it
+                # is toggled outside of the delete transaction)
+                self.conn.execute("PRAGMA foreign_keys = OFF")
+                try:
+                    with self.get_cursor() as cur:
+                        # Batch delete related data
+                        self._delete_segment_data(cur, segment_ids)
+
+                        # Delete segments
+                        cur.execute("DELETE FROM segments WHERE route_id = ?", (route_id,))
+                        logger.debug(f"Deleted segments for route {route_id}")
+
+                        # Delete route
+                        cur.execute("DELETE FROM routes WHERE route_id = ?", (route_id,))
+                        logger.debug(f"Deleted route {route_id}")
+                finally:
                     # Restore foreign key checks
-                    cur.execute("PRAGMA foreign_keys = ON")
+                    self.conn.execute("PRAGMA foreign_keys = ON")
             else:
                 # No segments, delete route directly
                 with self.get_cursor() as cur:
@@ -612,10 +906,7 @@ class SQLiteManager:
                     logger.warning(f"Segment {route_id}/{segment_number} already exists (ID: {segment_id}), deleting old data...")
 
                     # Delete associated timeseries_data, can_messages, log_messages, video_frame_timestamps
-                    cur.execute("DELETE FROM timeseries_data WHERE segment_id = ?", (segment_id,))
-                    cur.execute("DELETE FROM can_messages WHERE segment_id = ?", (segment_id,))
-                    cur.execute("DELETE FROM log_messages WHERE segment_id = ?", (segment_id,))
-                    cur.execute("DELETE FROM video_frame_timestamps WHERE segment_id = ?", (segment_id,))
+                    self._delete_segment_data(cur, [segment_id])
 
                     # Update segment information
                     cur.execute("""
@@ -673,7 +964,7 @@ class SQLiteManager:
     def get_segments_with_time(self, route_id: str) -> List[Dict]:
         """Get all segments for specified route"""
         try:
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 # Query route's start_timestamp
                 cur.execute("""
                     SELECT start_timestamp
@@ -746,9 +1037,18 @@ class SQLiteManager:
             return []
 
     def get_segment_by_id(self, segment_id: int) -> Optional[Dict]:
-        """Get segment information by ID"""
+        """Get segment information by ID (cached until the database changes)"""
+        use_cache = self._validate_caches()
+        if use_cache:
+            with self._cache_lock:
+                cached = self._segment_cache.get(segment_id)
+                if cached is not None:
+                    self._segment_cache.move_to_end(segment_id)
+            if cached is not None:
+                return dict(cached)
+
         try:
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 cur.execute("""
                     SELECT
                         segment_id, route_id, segment_number,
@@ -761,7 +1061,7 @@ class SQLiteManager:
                 row = cur.fetchone()
 
             if row:
-                return {
+                segment = {
                     'segment_id': row[0],
                     'route_id': row[1],
                     'segment_number': row[2],
@@ -773,21 +1073,141 @@ class SQLiteManager:
                     'qcamera_path': row[8],
                     'total_events': row[9]
                 }
+                if use_cache:
+                    with self._cache_lock:
+                        self._segment_cache[segment_id] = segment
+                        if len(self._segment_cache) > self.SEGMENT_CACHE_SIZE:
+                            self._segment_cache.popitem(last=False)
+                    return dict(segment)
+                return segment
             return None
 
         except sqlite3.Error as e:
             logger.error(f"Error getting segment: {e}")
             return None
 
+    def get_segment_meta(self, segment_id: int) -> Optional[Dict]:
+        """Get chart metadata of a segment in one query (cached until the database changes)
+
+        Returns:
+            {'start_time_ns', 'end_time_ns', 'segment_number', 'route_start_timestamp',
+            'data_start_ns', 'data_end_ns'}, or None if the segment doesn't exist.
+            The data times are None if the segment has no timeseries data.
+        """
+        use_cache = self._validate_caches()
+        if use_cache:
+            with self._cache_lock:
+                cached = self._segment_meta_cache.get(segment_id)
+                if cached is not None:
+                    self._segment_meta_cache.move_to_end(segment_id)
+            if cached is not None:
+                return dict(cached)
+
+        try:
+            with self._get_read_cursor() as cur:
+                cur.execute(self._SEGMENT_META_SQL, (segment_id,))
+                row = cur.fetchone()
+
+            if row is None:
+                return None
+
+            meta = {
+                'start_time_ns': row[0],
+                'end_time_ns': row[1],
+                'segment_number': row[2],
+                'route_start_timestamp': row[3],
+                'data_start_ns': row[4],
+                'data_end_ns': row[5]
+            }
+            if use_cache:
+                with self._cache_lock:
+                    self._segment_meta_cache[segment_id] = meta
+                    if len(self._segment_meta_cache) > self.SEGMENT_CACHE_SIZE:
+                        self._segment_meta_cache.popitem(last=False)
+                return dict(meta)
+            return meta
+
+        except sqlite3.Error as e:
+            logger.error(f"Error getting segment metadata: {e}")
+            return None
+
+    def get_segment_gps_times(self, route_segments: List[Tuple[str, int]]) -> Dict[Tuple[str, int], Tuple]:
+        """Get GPS / route timestamps of many segments in one query
+
+        Args:
+            route_segments: [(route_id, segment_number), ...]
+
+        Returns:
+            {(route_id, segment_number): (gps_timestamp, route_timestamp)} for
+            the segments that are in the database
+        """
+        if not route_segments:
+            return {}
+
+        try:
+            with self._get_read_cursor() as cur:
+                # One JSON array parameter (constant SQL text); CROSS JOIN keeps
+                # json_each as the outer loop, so each pair is one
+                # UNIQUE(route_id, segment_number) index lookup
+                cur.execute("""
+                    SELECT s.route_id, s.segment_number, s.gps_timestamp, r.timestamp
+                    FROM json_each(?) AS j
+                    CROSS JOIN segments s
+                      ON s.route_id = json_extract(j.value, '$[0]')
+                     AND s.segment_number = json_extract(j.value, '$[1]')
+                    JOIN routes r ON r.route_id = s.route_id
+                """, (json.dumps(route_segments),))
+                return {(route_id, segment_number): (gps_timestamp, route_timestamp)
+                        for route_id, segment_number, gps_timestamp, route_timestamp in cur.fetchall()}
+
+        except sqlite3.Error as e:
+            logger.error(f"Error getting segment GPS times: {e}")
+            return {}
+
+    def _delete_segment_data(self, cur, segment_ids: List[int]):
+        """Delete all per-segment data rows for the given segments
+
+        Each table is cleared with one range delete over its segment_id
+        index instead of relying on per-row ON DELETE CASCADE.
+        """
+        placeholders = ','.join('?' * len(segment_ids))
+
+        # Delete timeseries_data
+        cur.execute(f"DELETE FROM timeseries_data WHERE segment_id IN ({placeholders})", segment_ids)
+        logger.debug(f"Deleted timeseries_data for {len(segment_ids)} segments")
+
+        # Delete can_messages
+        cur.execute(f"DELETE FROM can_messages WHERE segment_id IN ({placeholders})", segment_ids)
+        logger.debug(f"Deleted can_messages for {len(segment_ids)} segments")
+
+        # Delete log_messages
+        cur.execute(f"DELETE FROM log_messages WHERE segment_id IN ({placeholders})", segment_ids)
+        logger.debug(f"Deleted log_messages for {len(segment_ids)} segments")
+
+        # Delete video_frame_timestamps
+        cur.execute(f"DELETE FROM video_frame_timestamps WHERE segment_id IN ({placeholders})", segment_ids)
+        logger.debug(f"Deleted video_frame_timestamps for {len(segment_ids)} segments")
+
     def delete_segments(self, segment_ids: List[int]) -> bool:
-        """Delete multiple segments"""
+        """Delete multiple segments (manual batch delete for performance)"""
+        if not segment_ids:
+            return True
+
         try:
-            with self.get_cursor() as cur:
-                placeholders = ','.join('?' * len(segment_ids))
-                cur.execute(
-                    f"DELETE FROM segments WHERE segment_id IN ({placeholders})",
-                    segment_ids
-                )
+            # Temporarily disable foreign key checks so child rows are not
+            # deleted a second time through the cascade
+            self.conn.execute("PRAGMA foreign_keys = OFF")
+            try:
+                with self.get_cursor() as cur:
+                    self._delete_segment_data(cur, segment_ids)
+
+                    placeholders = ','.join('?' * len(segment_ids))
+                    cur.execute(
+                        f"DELETE FROM segments WHERE segment_id IN ({placeholders})",
+                        segment_ids
+                    )
+            finally:
+                self.conn.execute("PRAGMA foreign_keys = ON")
             logger.info(f"Deleted {len(segment_ids)} segments")
             return True
         except sqlite3.Error as e:
@@ -822,7 +1242,8 @@ class SQLiteManager:
             raise
 
     def get_timeseries_data(self, segment_id: int, signal_names,
-                            start_time_ns: int, end_time_ns: int):
+                            start_time_ns: int, end_time_ns: int,
+                            limit: int = None):
         """Query timeseries data
 
         Args:
@@ -830,6 +1251,9 @@ class SQLiteManager:
             signal_names: Signal name (single string) or list of signal names
             start_time_ns: Start time
             end_time_ns: End time
+            limit: If set, at most this many rows per regular signal are
+                   returned (sanity cap; the signal's rows after it in time
+                   are dropped)
 
         Returns:
             If single string passed: List[(time_ns, value)]
@@ -857,20 +1281,28 @@ class SQLiteManager:
         # Query regular signals
         if regular_signals:
             try:
-                with self.get_cursor() as cur:
-                    placeholders = ','.join('?' * len(regular_signals))
-                    cur.execute(f"""
-                        SELECT signal_name, time_ns, value
-                        FROM timeseries_data
-                        WHERE segment_id = ?
-                          AND time_ns BETWEEN ? AND ?
-                          AND signal_name IN ({placeholders})
-                        ORDER BY time_ns
-                    """, (segment_id, start_time_ns, end_time_ns, *regular_signals))
+                unique_signals = list(dict.fromkeys(regular_signals))
+                with self._get_read_cursor() as cur:
+                    if limit or len(unique_signals) == 1:
+                        # One index range per signal, each with its own row
+                        # limit (a shared time-ordered LIMIT would cut every
+                        # signal at the same timestamp)
+                        row_limit = limit or -1
+                        for signal_name in unique_signals:
+                            cur.execute(self._SIGNAL_TIMESERIES_SQL,
+                                        (segment_id, signal_name, start_time_ns, end_time_ns, row_limit))
+                            result[signal_name] = cur.fetchall()
+                            if len(result[signal_name]) == row_limit:
+                                logger.warning(f"Timeseries query for {signal_name} hit the "
+                                               f"{row_limit} row limit, data truncated")
+                        rows = ()
+                    else:
+                        cur.execute(self._TIMESERIES_SQL,
+                                    (json.dumps(unique_signals), segment_id, start_time_ns, end_time_ns))
+                        rows = cur.fetchall()
 
-                    for row in cur.fetchall():
-                        signal_name, time_ns, value = row
-                        result[signal_name].append((time_ns, value))
+                for signal_name, time_ns, value in rows:
+                    result[signal_name].append((time_ns, value))
 
             except sqlite3.Error as e:
                 logger.error(f"Error getting timeseries data: {e}")
@@ -895,7 +1327,7 @@ class SQLiteManager:
         """Get all available signals for specified segment (including custom signals)"""
         try:
             # Get regular signals
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 cur.execute("""
                     SELECT DISTINCT signal_name
                     FROM timeseries_data
@@ -922,11 +1354,16 @@ class SQLiteManager:
         Returns:
             Dict of {signal_name: signal_info}
             signal_info contains: name_cn, description_cn, unit_cn, unit
+            (快取直到資料庫內容變更)
         """
+        use_cache = self._validate_caches()
+        if use_cache and self._defined_signals_cache is not None:
+            return dict(self._defined_signals_cache)
+
         signals = {}
 
         try:
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 # Get Cereal signal definitions
                 cur.execute("""
                     SELECT full_name, name_cn, description_cn, unit, unit_cn
@@ -961,6 +1398,10 @@ class SQLiteManager:
 
             logger.info(f"Loaded {len(signals)} signal definitions")
 
+            if use_cache:
+                self._defined_signals_cache = signals
+                return dict(signals)
+
         except sqlite3.Error as e:
             logger.warning(f"Failed to load signal definitions: {e}")
 
@@ -975,12 +1416,13 @@ class SQLiteManager:
 
         Args:
             segment_id: Segment ID
-            batch: List of (time_ns, address, data, _unused)
+            batch: List of (time_ns, address, data, _unused), data as bytes
         """
         try:
             # Convert format: add segment_id to each row, ignore 4th column (can_src)
-            data = [(segment_id, time_ns, address, can_data)
-                    for time_ns, address, can_data, _ in batch]
+            # Rows are streamed to executemany instead of building a second list
+            data = ((segment_id, time_ns, address, can_data)
+                    for time_ns, address, can_data, _ in batch)
 
             # Use conn.cursor() directly, not context manager to avoid auto commit
             cur = self.conn.cursor()
@@ -1001,17 +1443,17 @@ class SQLiteManager:
             List of (time_ns, address, data)
         """
         try:
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 if can_ids:
-                    placeholders = ','.join('?' * len(can_ids))
-                    cur.execute(f"""
+                    # CAN IDs bound as one JSON array so the SQL text stays constant
+                    cur.execute("""
                         SELECT time_ns, address, data
                         FROM can_messages
                         WHERE segment_id = ?
                           AND time_ns BETWEEN ? AND ?
-                          AND address IN ({placeholders})
+                          AND address IN (SELECT value FROM json_each(?))
                         ORDER BY time_ns
-                    """, (segment_id, start_time_ns, end_time_ns, *can_ids))
+                    """, (segment_id, start_time_ns, end_time_ns, json.dumps(list(can_ids))))
                 else:
                     cur.execute("""
                         SELECT time_ns, address, data
@@ -1056,7 +1498,7 @@ class SQLiteManager:
             raise
 
     def get_log_messages(self, segment_id: int, start_time_ns: int, end_time_ns: int,
-                         log_type: str = None) -> List[Dict]:
+                         log_type: str = None, columnar: bool = False):
         """Query log messages
 
         Args:
@@ -1064,14 +1506,18 @@ class SQLiteManager:
             start_time_ns: Start time (nanoseconds)
             end_time_ns: End time (nanoseconds)
             log_type: Log type filter ('log' or 'error', None means all)
+            columnar: If True, return one list per column instead of one dict
+                      per row (avoids per-row dict allocation for large fetches)
 
         Returns:
-            List of log message dicts with keys:
+            If columnar is False: List of log message dicts with keys:
                 time_ns, log_type, daemon, levelnum, filename, funcname, lineno,
                 message, dongle_id, version, branch, commit
+            If columnar is True: Dict[column_name, List] with the same keys,
+                all lists index-aligned
         """
         try:
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 if log_type:
                     cur.execute("""
                         SELECT
@@ -1094,25 +1540,17 @@ class SQLiteManager:
                         ORDER BY time_ns
                     """, (segment_id, start_time_ns, end_time_ns))
 
-                return [
-                    {
-                        'time_ns': row[0],
-                        'log_type': row[1],
-                        'daemon': row[2],
-                        'levelnum': row[3],
-                        'filename': row[4],
-                        'funcname': row[5],
-                        'lineno': row[6],
-                        'message': row[7],
-                        'dongle_id': row[8],
-                        'version': row[9],
-                        'branch': row[10],
-                        'commit': row[11]
-                    }
-                    for row in cur.fetchall()
-                ]
+                rows = cur.fetchall()
+
+            if columnar:
+                columns = zip(*rows) if rows else [()] * len(self.LOG_MESSAGE_COLUMNS)
+                return {name: list(values) for name, values in zip(self.LOG_MESSAGE_COLUMNS, columns)}
+
+            return [dict(zip(self.LOG_MESSAGE_COLUMNS, row)) for row in rows]
         except sqlite3.Error as e:
             logger.error(f"Error getting log messages: {e}")
+            if columnar:
+                return {name: [] for name in self.LOG_MESSAGE_COLUMNS}
             return []
 
     # ========================================================================
@@ -1152,7 +1590,7 @@ class SQLiteManager:
             List of timestamp_sof values, ordered by frame_number
         """
         try:
-            with self.get_cursor() as cur:
+            with self._get_read_cursor() as cur:
                 cur.execute("""
                     SELECT timestamp_sof
                     FROM video_frame_timestamps
@@ -1184,43 +1622,36 @@ class SQLiteManager:
             logger.error(f"Error inserting cereal signal definition: {e}")
 
     def get_signal_unit(self, signal_name: str) -> Tuple[Optional[str], Optional[str]]:
-        """Get signal unit (English, Chinese)"""
-        try:
-            with self.get_cursor() as cur:
-                # First check cereal signals
-                cur.execute("""
-                    SELECT unit, unit_cn
-                    FROM cereal_signal_definitions
-                    WHERE full_name = ?
-                """, (signal_name,))
-                row = cur.fetchone()
+        """Get signal unit (English, Chinese)
 
-                if row:
-                    return row[0], row[1]
+        Looks up cereal, CAN and custom signal definitions (in that order of
+        priority) with a single query on the signal_units_all view. Results
+        are cached until the database changes.
+        """
+        use_cache = self._validate_caches()
+        cached = self._signal_unit_cache.get(signal_name) if use_cache else None
+        if cached is not None:
+            return cached
 
-                # Then check CAN signals
+        try:
+            with self._get_read_cursor() as cur:
                 cur.execute("""
                     SELECT unit, unit_cn
-                    FROM can_signal_definitions
+                    FROM signal_units_all
                     WHERE full_name = ?
+                    ORDER BY priority
+                    LIMIT 1
                 """, (signal_name,))
                 row = cur.fetchone()
 
-                if row:
-                    return row[0], row[1]
+            result = (row[0], row[1]) if row else (None, None)
 
-                # Finally check custom signals
-                cur.execute("""
-                    SELECT unit, unit_cn
-                    FROM custom_signals
-                    WHERE signal_name = ?
-                """, (signal_name,))
-                row = cur.fetchone()
-
-                if row:
-                    return row[0], row[1]
-
-            return None, None
+            if use_cache:
+                with self._cache_lock:
+                    if len(self._signal_unit_cache) >= self.SIGNAL_UNIT_CACHE_SIZE:
+                        self._signal_unit_cache.clear()
+                    self._signal_unit_cache[signal_name] = result
+            return result
 
         except sqlite3.Error as e:
             logger.error(f"Error getting signal unit: {e}")
@@ -1231,7 +1662,11 @@ class SQLiteManager:
     # ========================================================================
 
     def update_segment_event_count(self, segment_id: int, count: int):
-        """Update segment event count"""
+        """Update segment event count
+
+        The route's total event count is maintained by the
+        trg_segments_events_* triggers.
+        """
         try:
             with self.get_cursor() as cur:
                 cur.execute("""
@@ -1239,41 +1674,23 @@ class SQLiteManager:
                     SET total_events = ?
                     WHERE segment_id = ?
                 """, (count, segment_id))
-
-                # Update route's total event count
-                cur.execute("""
-                    UPDATE routes
-                    SET total_events = (
-                        SELECT SUM(total_events)
-                        FROM segments
-                        WHERE route_id = routes.route_id
-                    )
-                    WHERE route_id = (
-                        SELECT route_id FROM segments WHERE segment_id = ?
-                    )
-                """, (segment_id,))
         except sqlite3.Error as e:
             logger.error(f"Error updating event count: {e}")
 
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
         try:
-            with self.get_cursor() as cur:
-                # Count records in each table
-                cur.execute("SELECT COUNT(*) FROM routes")
-                routes_count = cur.fetchone()[0]
-
-                cur.execute("SELECT COUNT(*) FROM segments")
-                segments_count = cur.fetchone()[0]
-
-                cur.execute("SELECT COUNT(*) FROM timeseries_data")
-                timeseries_count = cur.fetchone()[0]
-
-                cur.execute("SELECT COUNT(*) FROM can_messages")
-                can_count = cur.fetchone()[0]
-
-                cur.execute("SELECT COUNT(*) FROM log_messages")
-                log_count = cur.fetchone()[0]
+            with self._get_read_cursor() as cur:
+                # Count records in each table (single statement)
+                cur.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM routes),
+                        (SELECT COUNT(*) FROM segments),
+                        (SELECT COUNT(*) FROM timeseries_data),
+                        (SELECT COUNT(*) FROM can_messages),
+                        (SELECT COUNT(*) FROM log_messages)
+                """)
+                routes_count, segments_count, timeseries_count, can_count, log_count = cur.fetchone()
 
                 # Database file size
                 db_size = self.db_path.stat().st_size / (1024 * 1024)  # MB
@@ -1330,7 +1747,7 @@ class SQLiteManager:
 
                 logger.info(f"發現 {len(missing_signals)} 個缺失的訊號定義，開始自動創建...")
 
-                created_count = 0
+                rows = []
 
                 for full_signal_name in missing_signals:
                     # 從訊號名稱推斷資訊
@@ -1341,76 +1758,26 @@ class SQLiteManager:
                     msg_type = parts[0]
                     signal_name = full_signal_name[len(msg_type) + 1:]  # 移除 "msgType."
 
-                    # 根據訊號名稱推測資料類型
+                    # 根據訊號名稱推測資料類型與單位
                     lower_name = full_signal_name.lower()
-                    if any(x in lower_name for x in ['type', 'state', 'mode', 'name', 'ecu', 'event']):
-                        data_type = 'Int32'  # 枚舉類型
-                    elif any(x in lower_name for x in ['index', 'count', 'id', 'frame']):
-                        data_type = 'Int32'
-                    elif 'bool' in lower_name or any(x in lower_name for x in ['pressed', 'active', 'valid', 'enabled', 'detected']):
-                        data_type = 'Bool'
-                    else:
-                        data_type = 'Float32'  # 預設為浮點數
-
-                    # 根據訊號名稱推測單位
-                    unit = ''
-                    unit_cn = ''
-                    if 'speed' in lower_name or 'velocity' in lower_name:
-                        unit = 'm/s'
-                        unit_cn = '公尺/秒'
-                    elif 'accel' in lower_name:
-                        unit = 'm/s²'
-                        unit_cn = '公尺/秒²'
-                    elif 'angle' in lower_name and 'deg' in lower_name:
-                        unit = 'deg'
-                        unit_cn = '度'
-                    elif 'rate' in lower_name and ('deg' in lower_name or 'yaw' in lower_name or 'pitch' in lower_name):
-                        unit = 'deg/s'
-                        unit_cn = '度/秒'
-                    elif 'distance' in lower_name or 'drel' in lower_name or 'wheelbase' in lower_name:
-                        unit = 'm'
-                        unit_cn = '公尺'
-                    elif 'torque' in lower_name:
-                        unit = 'Nm'
-                        unit_cn = '牛頓·公尺'
-                    elif 'temp' in lower_name or 'temperature' in lower_name:
-                        unit = '°C'
-                        unit_cn = '攝氏度'
-                    elif 'percent' in lower_name:
-                        unit = '%'
-                        unit_cn = '%'
-                    elif 'voltage' in lower_name:
-                        unit = 'V'
-                        unit_cn = '伏特'
-                    elif 'current' in lower_name:
-                        unit = 'A'
-                        unit_cn = '安培'
-                    elif 'power' in lower_name and 'w' in lower_name:
-                        unit = 'W'
-                        unit_cn = '瓦特'
-                    elif 'time' in lower_name and ('ms' in lower_name or 'milli' in lower_name):
-                        unit = 'ms'
-                        unit_cn = '毫秒'
-                    elif 'time' in lower_name:
-                        unit = 's'
-                        unit_cn = '秒'
-                    elif 'rpm' in lower_name:
-                        unit = 'rpm'
-                        unit_cn = '轉/分'
+                    data_type = _infer_data_type(lower_name)
+                    unit, unit_cn = _infer_unit(lower_name)
 
                     # 中文名稱（目前留空，可以後續手動補充）
                     name_cn = ''
 
-                    # 插入資料庫
-                    try:
-                        cur.execute("""
-                            INSERT OR REPLACE INTO cereal_signal_definitions
-                            (message_type, signal_name, full_name, data_type, unit, unit_cn, name_cn)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (msg_type, signal_name, full_signal_name, data_type, unit, unit_cn, name_cn))
-                        created_count += 1
-                    except Exception as e:
-                        logger.error(f"創建訊號定義失敗 {full_signal_name}: {e}")
+                    rows.append((msg_type, signal_name, full_signal_name, data_type, unit, unit_cn, name_cn))
+
+                if not rows:
+                    return 0
+
+                # 一次批次插入資料庫（同一個交易）
+                cur.executemany("""
+                    INSERT OR REPLACE INTO cereal_signal_definitions
+                    (message_type, signal_name, full_name, data_type, unit, unit_cn, name_cn)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                created_count = len(rows)
 
                 logger.info(f"成功創建 {created_count} 個訊號定義")
                 return created_count
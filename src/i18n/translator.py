@@ -5,14 +5,36 @@ Translation Manager
 
 提供應用程式的多語言支援 (JSON-based)
 """
-from PyQt6.QtCore import QLocale, QSettings
+from PyQt6.QtCore import QLocale, QSettings, QStandardPaths
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional
+import os
+import sys
 import json
+import marshal
 import logging
+import importlib.util
+
+# Optional: orjson parses UTF-8 bytes directly (faster than json.load)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+# 語系語言前綴 -> 支援的語言代碼（例如 zh_CN、zh_HK 都使用繁體中文）
+_PREFIX_MAP = {'zh': 'zh_TW', 'en': 'en_US'}
+
+
+def _identity(key: str) -> str:
+    """英文模式的翻譯函式：直接返回原文"""
+    return key
+
+
 class TranslationManager:
     """管理應用程式的翻譯 (使用 JSON 檔案)"""
 
@@ -21,12 +43,29 @@ class TranslationManager:
         'en_US': 'English'
     }
 
+    # 支援語言代碼集合（interned）與唯讀檢視，避免每次呼叫時複製
+    _SUPPORTED_SET = frozenset(sys.intern(code) for code in SUPPORTED_LANGUAGES)
+    _SUPPORTED_VIEW = MappingProxyType(SUPPORTED_LANGUAGES)
+
+    # 固定的實例屬性，不建立 __dict__。t 為 slot：由 _set_translations 依語言狀態綁定
+    # 翻譯函式，因此類別上不能另有同名方法。偏好與系統語言快取屬於類別層級，不在此列。
+    __slots__ = ('current_language', 'translations', 'i18n_dir', '_lang_files', 't')
+
+    # 已儲存語言偏好的快取（QSettings 為整個程序共用，因此放在類別層級）
+    _pref_loaded = False
+    _pref_cache: Optional[str] = None
+
+    # 系統語言偵測結果的快取
+    _system_lang: Optional[str] = None
+
+    # 已解析的翻譯字典 {翻譯檔路徑: 字典}，由所有實例共用（唯讀使用）
+    _catalogs: dict = {}
+
     def __init__(self):
         self.current_language = 'en_US'
-        self.translations = {}  # 翻譯字典
+        self._set_translations({})  # 翻譯字典（英文模式）
 
         # i18n 目錄路徑 - 支援開發模式和編譯後的 EXE
-        import sys
         if getattr(sys, 'frozen', False):
             # 編譯後的 EXE：i18n 在 exe 同級目錄
             exe_dir = Path(sys.executable).parent
@@ -35,8 +74,13 @@ class TranslationManager:
             # 開發模式：從當前檔案路徑計算
             self.i18n_dir = Path(__file__).parent.parent.parent / 'i18n'
 
-        # 確保目錄存在
-        self.i18n_dir.mkdir(exist_ok=True)
+        # 不在此建立目錄：只會從中讀取翻譯檔，缺少目錄時 load_language 會回退為英文
+
+        # 預先計算各語言翻譯檔路徑（英文為源碼語言，沒有翻譯檔）
+        self._lang_files = {
+            code: self.i18n_dir / f"{code}.json"
+            for code in self.SUPPORTED_LANGUAGES if code != 'en_US'
+        }
 
     def load_language(self, language_code: str) -> bool:
         """
@@ -48,53 +92,168 @@ class TranslationManager:
         Returns:
             bool: 是否成功載入
         """
-        if language_code not in self.SUPPORTED_LANGUAGES:
+        if language_code not in self._SUPPORTED_SET:
             logger.warning(f"Unsupported language: {language_code}")
             return False
+        language_code = sys.intern(language_code)
 
         # 如果是英文，不需要載入翻譯檔（使用源碼中的英文）
         if language_code == 'en_US':
             self.current_language = language_code
-            self.translations = {}  # 清空翻譯
+            self._set_translations({})  # 清空翻譯
             logger.info("Using default English (source language)")
             return True
 
-        # 載入 JSON 翻譯檔
-        json_file = self.i18n_dir / f"{language_code}.json"
-        if json_file.exists():
+        # 本程序已載入過的翻譯檔直接沿用，切換語言只需替換字典
+        json_file = self._lang_files[language_code]
+        translations = self._catalogs.get(json_file)
+        if translations is None:
+            # 載入 JSON 翻譯檔（直接嘗試讀取，不先檢查檔案是否存在）
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    self.translations = json.load(f)
-                self.current_language = language_code
-                logger.info(f"Loaded language: {language_code} ({len(self.translations)} translations)")
-                return True
+                loaded = self._load_catalog(json_file)
+            except FileNotFoundError:
+                logger.warning(f"Translation file not found: {json_file}")
+                self._set_translations({})
+                self.current_language = 'en_US'
+                return False
             except Exception as e:
                 logger.error(f"Failed to load translation file {json_file}: {e}")
-                self.translations = {}
+                self._set_translations({})
                 self.current_language = 'en_US'
                 return False
-        else:
-            logger.warning(f"Translation file not found: {json_file}")
-            self.translations = {}
-            self.current_language = 'en_US'
-            return False
 
-    def t(self, key: str) -> str:
+            # 鍵 intern 化：與源碼中同樣被 intern 的字串常值比對時，dict 查找以指標相等即可命中
+            translations = {sys.intern(k): v for k, v in loaded.items()}
+            self._catalogs[json_file] = translations
+
+        self._set_translations(translations)
+        self.current_language = language_code
+        logger.info(f"Loaded language: {language_code} ({len(self.translations)} translations)")
+        return True
+
+    def _load_catalog(self, json_file: Path) -> dict:
+        """
+        解析翻譯 JSON 檔，使用使用者快取目錄中的 marshal 快取略過 JSON 解析
+
+        快取存放於 QStandardPaths 的 CacheLocation（不寫入 i18n 目錄），以 JSON 檔的
+        路徑、st_mtime_ns 和大小為鍵，JSON 變更後自動重建。marshal 只還原資料，
+        不會像 pickle 一樣在載入時執行程式碼。
+
+        Args:
+            json_file: 翻譯 JSON 檔路徑
+
+        Returns:
+            dict: 翻譯字典
+        """
+        stat = json_file.stat()
+        compiled = self._load_compiled_catalog(json_file, stat)
+        if compiled is not None:
+            return compiled
+
+        key = (str(json_file.resolve()), stat.st_mtime_ns, stat.st_size)
+        cache_file = self._catalog_cache_file(json_file)
+
+        if cache_file is not None:
+            try:
+                cached_key, translations = marshal.loads(cache_file.read_bytes())
+                if tuple(cached_key) == key and isinstance(translations, dict):
+                    return translations
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.debug(f"Ignoring invalid translation cache {cache_file}: {e}")
+
+        # 一次讀入位元組，兩種解析器都直接接受 UTF-8 bytes，略過文字模式解碼
+        raw = json_file.read_bytes()
+        translations = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+        # 寫入快取（快取目錄無法使用時略過）
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_bytes(marshal.dumps((key, translations)))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Could not write translation cache {cache_file}: {e}")
+
+        return translations
+
+    @staticmethod
+    def _catalog_cache_file(json_file: Path) -> Optional[Path]:
         """
-        取得翻譯文字
+        取得翻譯檔在使用者快取目錄中的快取檔路徑
 
         Args:
-            key: 英文原文
+            json_file: 翻譯 JSON 檔路徑
 
         Returns:
-            str: 翻譯後的文字，如果找不到則返回原文
+            Optional[Path]: 快取檔路徑，系統沒有快取目錄時返回 None
+        """
+        cache_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+        if not cache_dir:
+            return None
+        return Path(cache_dir) / 'i18n' / f"{json_file.name}.marshal"
+
+    def _load_compiled_catalog(self, json_file: Path, stat: os.stat_result) -> Optional[dict]:
         """
-        # 如果是英文模式或找不到翻譯，返回原文
-        return self.translations.get(key, key)
+        載入 tools/compile_translations.py 產生的翻譯模組（i18n/_<code>.py）
+
+        模組的 TRANSLATIONS 由 .pyc 以 marshal 載入，不需解析 JSON。
+        模組記錄的 JSON st_mtime_ns 和大小與目前不符（JSON 已被修改）時不使用，
+        比對只需 stat，不必讀取 JSON。
+
+        Args:
+            json_file: 翻譯 JSON 檔路徑
+            stat: JSON 檔目前的 stat 結果
+
+        Returns:
+            Optional[dict]: 翻譯字典，沒有可用的編譯模組時返回 None
+        """
+        module_file = json_file.with_name(f"_{json_file.stem}.py")
+        try:
+            spec = importlib.util.spec_from_file_location(f"_i18n_{json_file.stem}", module_file)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring invalid compiled catalog {module_file}: {e}")
+            return None
+
+        if (getattr(module, 'SOURCE_MTIME_NS', None), getattr(module, 'SOURCE_SIZE', None)) != (stat.st_mtime_ns, stat.st_size):
+            logger.debug(f"Compiled catalog {module_file} is out of date, parsing JSON")
+            return None
+        return module.TRANSLATIONS
+
+    def _set_translations(self, translations: dict):
+        """
+        設定翻譯字典，並依狀態替換 self.t 的實作
+
+        self.t(key) 取得翻譯文字，找不到時返回英文原文。英文模式（空字典）
+        綁定為直接返回原文；翻譯模式綁定為預先取出的 dict.get，省去每次
+        呼叫時的屬性查找。
+        """
+        self.translations = translations
+        if translations:
+            self.t = lambda key, _get=translations.get: _get(key, key)
+        else:
+            self.t = _identity
 
     def get_system_language(self) -> str:
         """
-        取得系統預設語言
+        取得系統預設語言（程序生命週期內只查詢一次系統語系）
+
+        Returns:
+            str: 語言代碼
+        """
+        cls = type(self)
+        if cls._system_lang is None:
+            cls._system_lang = cls._detect_system_language()
+        return cls._system_lang
+
+    @classmethod
+    def _detect_system_language(cls) -> str:
+        """
+        從系統語系推測語言代碼
 
         Returns:
             str: 語言代碼
@@ -102,18 +261,11 @@ class TranslationManager:
         locale = QLocale.system().name()  # 例如: zh_TW, en_US
 
         # 如果系統語言在支援列表中，直接使用
-        if locale in self.SUPPORTED_LANGUAGES:
+        if locale in cls._SUPPORTED_SET:
             return locale
 
-        # 否則根據語言代碼匹配
-        lang_code = locale.split('_')[0]
-        if lang_code == 'zh':
-            return 'zh_TW'
-        elif lang_code == 'en':
-            return 'en_US'
-
-        # 預設使用英文（國際化版本）
-        return 'en_US'
+        # 否則根據語言代碼匹配，預設使用英文（國際化版本）
+        return _PREFIX_MAP.get(locale.partition('_')[0], 'en_US')
 
     def save_language_preference(self, language_code: str):
         """
@@ -122,8 +274,14 @@ class TranslationManager:
         Args:
             language_code: 語言代碼
         """
+        cls = type(self)
+        if cls._pref_loaded and language_code == cls._pref_cache:
+            return
+
         settings = QSettings('OpenpilotViewer', 'Application')
         settings.setValue('language', language_code)
+        cls._pref_cache = language_code
+        cls._pref_loaded = True
         logger.info(f"Saved language preference: {language_code}")
 
     def load_language_preference(self) -> str:
@@ -133,23 +291,27 @@ class TranslationManager:
         Returns:
             str: 語言代碼，如果沒有儲存則返回系統語言
         """
-        settings = QSettings('OpenpilotViewer', 'Application')
-        language = settings.value('language', None)
+        cls = type(self)
+        if not cls._pref_loaded:
+            settings = QSettings('OpenpilotViewer', 'Application')
+            language = settings.value('language', None)
+            cls._pref_cache = language if language in self._SUPPORTED_SET else None
+            cls._pref_loaded = True
 
-        if language and language in self.SUPPORTED_LANGUAGES:
-            return language
+        if cls._pref_cache:
+            return cls._pref_cache
 
         # 如果沒有儲存或不支援，使用系統語言
         return self.get_system_language()
 
-    def get_available_languages(self) -> dict:
+    def get_available_languages(self) -> Mapping[str, str]:
         """
         取得可用的語言列表
 
         Returns:
-            dict: {語言代碼: 語言名稱}
+            Mapping: {語言代碼: 語言名稱}（唯讀檢視）
         """
-        return self.SUPPORTED_LANGUAGES.copy()
+        return self._SUPPORTED_VIEW
 
     def get_current_language(self) -> str:
         """
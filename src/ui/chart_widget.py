@@ -5,8 +5,10 @@ Chart Widget - Multi-signal overlay chart
 """
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel,
                              QMenu, QInputDialog)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QElapsedTimer, PYQT_VERSION
+from PyQt6 import sip
 from PyQt6.QtGui import QAction
+from datetime import datetime
 import logging
 from typing import List, Dict
 
@@ -18,8 +20,85 @@ except ImportError:
     PYQTGRAPH_AVAILABLE = False
     logging.warning("pyqtgraph not available, charts will not work")
 
+# Optional: PyOpenGL lets pyqtgraph draw curves through OpenGL instead of QPainterPath
+try:
+    import OpenGL
+    OPENGL_AVAILABLE = True
+except ImportError:
+    OPENGL_AVAILABLE = False
+
+# pyqtgraph 0.14 的實驗性繪圖路徑為全域設定，於匯入時設定一次（不在每個圖表元件中重複設定）
+if PYQTGRAPH_AVAILABLE and OPENGL_AVAILABLE:
+    pg.setConfigOption('enableExperimental', True)
+
+# Optional: Numba compiles the single-pass min/max used by the dual Y-axis check
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 寬度 > 1 的曲線由 pyqtgraph 以 QLineF 線段繪製；PyQt6 >= 6.3.1 可用 sip.array 直接傳遞，
+# 較舊版本需逐一建立 QLineF 的 Python 列表，因此改用 1 像素寬的畫筆
+_CURVE_PEN_WIDTH = 2 if hasattr(sip, 'array') and PYQT_VERSION >= 0x060301 else 1
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _min_max(values):
+        """單次掃描取得最小值與最大值"""
+        lo = hi = values[0]
+        for i in range(1, values.shape[0]):
+            v = values[i]
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        return lo, hi
+else:
+    def _min_max(values):
+        """取得最小值與最大值（未安裝 Numba 時使用 NumPy）"""
+        return values.min(), values.max()
+
+
+def _m4_downsample(time_ns, values, start_ns: int, bucket_ns: int):
+    """
+    M4 降採樣：每個像素寬的時間區間只保留第一點、最後一點、最小值與最大值
+
+    繪製結果與原始折線在像素上相同，但點數最多為區間數的 4 倍。
+
+    Args:
+        time_ns: 已排序的時間陣列 (ns)
+        values: 對應的數值陣列
+        start_ns: 視窗起始時間 (ns)
+        bucket_ns: 每個區間的寬度 (ns)
+
+    Returns:
+        (time_ns, values): 降採樣後的陣列
+    """
+    buckets = (time_ns - start_ns) // bucket_ns
+    new_bucket = np.empty(len(buckets), dtype=bool)
+    new_bucket[0] = True
+    np.not_equal(buckets[1:], buckets[:-1], out=new_bucket[1:])
+    firsts = np.flatnonzero(new_bucket)
+    lasts = np.append(firsts[1:], len(buckets)) - 1
+    counts = lasts - firsts + 1
+
+    keep = [firsts, lasts]
+    for reduce in (np.minimum, np.maximum):
+        # 每個區間中第一個達到極值的點
+        hits = np.flatnonzero(values == np.repeat(reduce.reduceat(values, firsts), counts))
+        hit_buckets = buckets[hits]
+        first_hit = np.empty(len(hits), dtype=bool)
+        first_hit[0] = True
+        np.not_equal(hit_buckets[1:], hit_buckets[:-1], out=first_hit[1:])
+        keep.append(hits[first_hit])
+
+    idx = np.unique(np.concatenate(keep))
+    return time_ns[idx], values[idx]
+
 
 class ChartWidget(QWidget):
     """
@@ -37,6 +116,13 @@ class ChartWidget(QWidget):
     # 信號：圖表更新完成
     charts_updated = pyqtSignal()
 
+    # hover 數值標籤的外框 HTML
+    _LABEL_HTML_OPEN = "<div style='background-color: rgba(255, 255, 255, 200); padding: 4px; border: 1px solid black;'>"
+    _LABEL_HTML_CLOSE = "</div>"
+
+    # 每個訊號最多查詢的樣本數（±10 秒視窗下遠超過像素數 × 4，只防止異常資料拖慢 UI）
+    MAX_SAMPLES_PER_SIGNAL = 20000
+
     def __init__(self, parent=None, translation_manager=None):
         super().__init__(parent)
 
@@ -50,7 +136,8 @@ class ChartWidget(QWidget):
         self.selected_signals: List[str] = []
         self.signal_colors: Dict[str, str] = {}
         # 存儲當前繪製的資料，用於滑鼠 hover 查找
-        self.plot_data: Dict[str, List[tuple]] = {}  # {signal_name: [(time_ns, value)]}
+        # {signal_name: (time_ns int64 陣列, value float64 陣列)}，兩個欄位各自連續存放
+        self.plot_data: Dict[str, tuple] = {}
 
         # 主題設定
         self.is_dark_theme = False
@@ -58,13 +145,28 @@ class ChartWidget(QWidget):
         # 播放狀態（用於控制十字線顯示）
         self.is_playing = False
 
-        # 播放優化：跳幀更新（每 N 幀更新一次圖表）
-        self.frame_skip_interval = 3  # 每 3 幀更新一次
-        self.frame_counter = 0
+        # 播放優化：依實際經過時間限制圖表更新頻率（不受每幀耗時不均影響）
+        self.min_frame_interval_ms = 1000 // 30  # 最多約 30 fps，可調整
+        self._draw_timer = QElapsedTimer()
+        self._draw_timer.start()
+        self._last_drawn_time_ns = None  # 上次成功繪製時的 current_time_ns
 
         # 雙 Y 軸設定
         self.use_dual_y_axis = True  # 預設啟用自動雙 Y 軸
-        self.viewbox_right = None  # 右側 Y 軸的 ViewBox
+        self.viewbox_right = None  # 右側 Y 軸的 ViewBox（setup_ui 建立一次，依模式顯示/隱藏）
+
+        # 持續存在的曲線（每幀只更新資料，不重建圖形項目）
+        self._curves: Dict[str, "pg.PlotDataItem"] = {}        # 左側（主）Y 軸
+        self._right_curves: Dict[str, "pg.PlotDataItem"] = {}  # 右側 Y 軸
+        # 每個訊號可重複使用的相對時間緩衝區（避免每幀重新配置陣列）
+        self._time_buffers: Dict[str, "np.ndarray"] = {}
+
+        # 滑鼠 hover 節流：合併同一顯示幀內的多次移動事件，只處理最後一次
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.timeout.connect(self._do_hover_update)
+        self._pending_hover_pos = None
+        self._last_label_lines = None  # 上次設定到標籤的內容，相同時略過 setHtml
 
         # Translation manager
         self.translation_manager = translation_manager
@@ -93,6 +195,8 @@ class ChartWidget(QWidget):
 
         # pyqtgraph PlotWidget
         self.plot_widget = pg.PlotWidget()
+        if OPENGL_AVAILABLE:
+            self.plot_widget.useOpenGL(True)  # 曲線以 OpenGL 繪製
         self.plot_widget.setBackground('w')
         self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
         self.plot_widget.setLabel('left', 'Value')
@@ -119,12 +223,26 @@ class ChartWidget(QWidget):
         # 初始化時移到範圍外（隱藏）
         self.crosshair_v.setPos(-1000)
         self.crosshair_h.setPos(-1000)
+        self.crosshair_h.setVisible(False)  # 只使用垂直線
 
         # 數值標籤（anchor=(0, 0) 表示左上角對齊，這樣 label 會從設定位置向下延伸）
         self.label = pg.TextItem(anchor=(0, 0), color='k', fill=(255, 255, 255, 200))
         self.plot_widget.addItem(self.label, ignoreBounds=True)  # 不影響圖表範圍
         self.label.setVisible(False)
 
+        # 右側 Y 軸的 ViewBox：只建立一次並保留在場景中，單 Y 軸模式時隱藏
+        plot_item = self.plot_widget.getPlotItem()
+        self.viewbox_right = pg.ViewBox()
+        self.plot_widget.scene().addItem(self.viewbox_right)
+        plot_item.getAxis('right').linkToView(self.viewbox_right)
+        self.viewbox_right.setXLink(plot_item)
+        self.viewbox_right.enableAutoRange(axis=pg.ViewBox.YAxis)
+        self.viewbox_right.hide()
+
+        # 同步更新右側 ViewBox 的大小（只連接一次）
+        self._sync_right_viewbox()
+        plot_item.vb.sigResized.connect(self._sync_right_viewbox)
+
         # 滑鼠移動事件
         self.plot_widget.scene().sigMouseMoved.connect(self.on_mouse_moved)
         self.plot_widget.setMouseTracking(True)
@@ -134,6 +252,12 @@ class ChartWidget(QWidget):
         # 設定右鍵選單
         self.setup_context_menu()
 
+    def _sync_right_viewbox(self):
+        """讓右側 ViewBox 與主 ViewBox 的位置和 X 範圍一致"""
+        main_vb = self.plot_widget.getPlotItem().vb
+        self.viewbox_right.setGeometry(main_vb.sceneBoundingRect())
+        self.viewbox_right.linkedViewChanged(main_vb, self.viewbox_right.XAxis)
+
     def set_database_manager(self, db_manager):
         """設定資料庫管理器"""
         self.db_manager = db_manager
@@ -174,12 +298,13 @@ class ChartWidget(QWidget):
     def set_segment(self, segment_id: int):
         """設定當前 Segment"""
         self.current_segment_id = segment_id
+        self._last_drawn_time_ns = None
 
-        # 取得 segment 的時間範圍和實際時間
-        segment = self.db_manager.get_segment_by_id(segment_id) if self.db_manager else None
-        if segment:
-            self.segment_start_time_ns = segment['start_time_ns']
-            self.segment_end_time_ns = segment['end_time_ns']
+        # 取得 segment 的時間範圍和實際時間（segment、route 起始時間與數據時間範圍一次查詢，結果由 db_manager 快取）
+        meta = self.db_manager.get_segment_meta(segment_id) if self.db_manager else None
+        if meta:
+            self.segment_start_time_ns = meta['start_time_ns']
+            self.segment_end_time_ns = meta['end_time_ns']
 
             # 診斷日誌：輸出 segment 時間範圍
             logger.info(f"📊 Segment {segment_id} time range:")
@@ -188,24 +313,10 @@ class ChartWidget(QWidget):
             logger.info(f"   duration: {(self.segment_end_time_ns - self.segment_start_time_ns) / 1e9:.2f} 秒")
 
             # 獲取 route 的 start_timestamp 來計算實際時間
-            try:
-                cursor = self.db_manager.conn.cursor()
-                cursor.execute("""
-                    SELECT r.start_timestamp, s.segment_number
-                    FROM routes r
-                    JOIN segments s ON r.route_id = s.route_id
-                    WHERE s.segment_id = ?
-                """, (segment_id,))
-                result = cursor.fetchone()
-                cursor.close()
-                if result and result[0]:
-                    route_start_timestamp, segment_num = result
-                    # 計算此 segment 的實際起始時間
-                    self.segment_start_timestamp = route_start_timestamp + (segment_num * 60)
-                else:
-                    self.segment_start_timestamp = None
-            except Exception as e:
-                logger.error(f"Failed to get segment actual time: {e}")
+            if meta['route_start_timestamp']:
+                # 計算此 segment 的實際起始時間
+                self.segment_start_timestamp = meta['route_start_timestamp'] + (meta['segment_number'] * 60)
+            else:
                 self.segment_start_timestamp = None
         else:
             self.segment_start_time_ns = None
@@ -215,48 +326,32 @@ class ChartWidget(QWidget):
 
         # 設置初始播放時間（使用實際數據的開始時間，但不覆蓋 segment 的時間範圍）
         if self.db_manager:
-            try:
-                # 查詢實際數據的最小和最大時間戳記（用於診斷）
-                cursor = self.db_manager.conn.cursor()
-                cursor.execute("""
-                    SELECT MIN(time_ns), MAX(time_ns)
-                    FROM timeseries_data
-                    WHERE segment_id = ?
-                """, (segment_id,))
-                result = cursor.fetchone()
-                cursor.close()
-                if result and result[0]:
-                    data_start_ns = result[0]
-                    data_end_ns = result[1]
-
-                    # 保存實際數據的結束時間
-                    self.actual_data_end_time_ns = data_end_ns
-
-                    # 診斷日誌：輸出實際數據的時間範圍
-                    logger.info(f"📈 Actual data time range:")
-                    logger.info(f"   data_start_ns: {data_start_ns}")
-                    logger.info(f"   data_end_ns: {data_end_ns}")
-                    logger.info(f"   data duration: {(data_end_ns - data_start_ns) / 1e9:.2f} 秒")
-
-                    # 檢查數據是否超出 segment 範圍
-                    if self.segment_start_time_ns and data_start_ns < self.segment_start_time_ns:
-                        logger.warning(f"⚠️  Data start time is {(self.segment_start_time_ns - data_start_ns) / 1e9:.2f} seconds earlier than segment start time")
-                    if self.segment_end_time_ns and data_end_ns > self.segment_end_time_ns:
-                        logger.warning(f"⚠️  Data end time is {(data_end_ns - self.segment_end_time_ns) / 1e9:.2f} seconds later than segment end time")
-                    elif self.segment_end_time_ns and data_end_ns < self.segment_end_time_ns:
-                        logger.warning(f"⚠️  Data end time is {(self.segment_end_time_ns - data_end_ns) / 1e9:.2f} seconds earlier than segment theoretical end time")
-
-                    # 設置為實際數據開始時間（但保持 segment 的時間範圍不變）
-                    self.current_time_ns = data_start_ns
-                else:
-                    # 如果沒有數據，使用 segment 的時間
-                    if segment:
-                        self.current_time_ns = segment['start_time_ns']
-            except Exception as e:
-                logger.error(f"Failed to get data time range: {e}")
-                # 錯誤時使用 segment 的時間
-                if segment:
-                    self.current_time_ns = segment['start_time_ns']
+            if meta and meta['data_start_ns']:
+                data_start_ns = meta['data_start_ns']
+                data_end_ns = meta['data_end_ns']
+
+                # 保存實際數據的結束時間
+                self.actual_data_end_time_ns = data_end_ns
+
+                # 診斷日誌：輸出實際數據的時間範圍
+                logger.info(f"📈 Actual data time range:")
+                logger.info(f"   data_start_ns: {data_start_ns}")
+                logger.info(f"   data_end_ns: {data_end_ns}")
+                logger.info(f"   data duration: {(data_end_ns - data_start_ns) / 1e9:.2f} 秒")
+
+                # 檢查數據是否超出 segment 範圍
+                if self.segment_start_time_ns and data_start_ns < self.segment_start_time_ns:
+                    logger.warning(f"⚠️  Data start time is {(self.segment_start_time_ns - data_start_ns) / 1e9:.2f} seconds earlier than segment start time")
+                if self.segment_end_time_ns and data_end_ns > self.segment_end_time_ns:
+                    logger.warning(f"⚠️  Data end time is {(data_end_ns - self.segment_end_time_ns) / 1e9:.2f} seconds later than segment end time")
+                elif self.segment_end_time_ns and data_end_ns < self.segment_end_time_ns:
+                    logger.warning(f"⚠️  Data end time is {(self.segment_end_time_ns - data_end_ns) / 1e9:.2f} seconds earlier than segment theoretical end time")
+
+                # 設置為實際數據開始時間（但保持 segment 的時間範圍不變）
+                self.current_time_ns = data_start_ns
+            elif meta:
+                # 如果沒有數據，使用 segment 的時間
+                self.current_time_ns = meta['start_time_ns']
 
     def set_signals(self, signal_names: List[str], signal_colors: Dict[str, str]):
         """
@@ -268,6 +363,13 @@ class ChartWidget(QWidget):
         """
         self.selected_signals = signal_names
         self.signal_colors = signal_colors
+        self._time_buffers = {name: buf for name, buf in self._time_buffers.items() if name in signal_names}
+
+        # 既有曲線的顏色可能改變
+        for curves in (self._curves, self._right_curves):
+            for signal_name, curve in curves.items():
+                curve.setPen(pg.mkPen(color=signal_colors.get(signal_name, '#000000'), width=_CURVE_PEN_WIDTH))
+
         self.update_charts()
 
     def get_current_signals(self) -> List[str]:
@@ -282,89 +384,99 @@ class ChartWidget(QWidget):
             # 更新垂直線位置 (相對於視窗中心)
             self.vline.setPos(0)
 
-        # 播放時跳幀更新（優化效能）
+        # 視窗位移不到半個像素時畫面不會改變，直接略過重繪
+        if self._is_subpixel_shift():
+            self.charts_updated.emit()
+            return
+
+        # 播放時距上次繪製未滿 min_frame_interval_ms 則略過（優化效能）
         if self.is_playing:
-            self.frame_counter += 1
-            if self.frame_counter >= self.frame_skip_interval:
-                self.frame_counter = 0
+            if self._draw_timer.elapsed() >= self.min_frame_interval_ms:
+                self._draw_timer.restart()
                 self.update_charts()
             # 即使跳過更新也發送信號，避免阻塞播放
             self.charts_updated.emit()
         else:
             # 暫停時正常更新
-            self.frame_counter = 0  # 重置計數器
+            self._draw_timer.restart()
             self.update_charts()
             self.charts_updated.emit()
 
-    def _should_use_dual_y_axis(self, signal_data: Dict[str, List[tuple]]) -> bool:
+    def _is_subpixel_shift(self) -> bool:
+        """自上次繪製後視窗位移是否小於半個像素（且顯示的訊號未改變）"""
+        if self._last_drawn_time_ns is None or not PYQTGRAPH_AVAILABLE:
+            return False
+        if self._curves.keys() | self._right_curves.keys() != set(self.selected_signals):
+            return False
+        pixel_width = max(1, self.plot_widget.width())
+        ns_per_pixel = 2 * 10 * 1_000_000_000 // pixel_width  # ±10 秒視窗
+        return abs(self.current_time_ns - self._last_drawn_time_ns) < ns_per_pixel // 2
+
+    def _should_use_dual_y_axis(self, signal_data: Dict[str, tuple]) -> bool:
         """
         判斷是否應該使用雙 Y 軸
 
         Args:
-            signal_data: {signal_name: [(time_ns, value), ...]}
+            signal_data: {signal_name: (time_ns 陣列, value 陣列)}
 
         Returns:
             True 如果應該使用雙 Y 軸
         """
-        # 播放時減少 logging（優化效能）
-        verbose_log = not self.is_playing
+        # 播放時減少 logging（優化效能）；f-string 在呼叫前就會求值，因此先確認 logger 層級
+        verbose_log = not self.is_playing and logger.isEnabledFor(logging.DEBUG)
 
         if not self.use_dual_y_axis:
             if verbose_log:
-                logger.info(f"Dual Y-axis feature disabled")
+                logger.debug(f"Dual Y-axis feature disabled")
             return False
 
         if len(signal_data) < 2:
             if verbose_log:
-                logger.info(f"Signal count < 2, not using dual Y-axis")
+                logger.debug(f"Signal count < 2, not using dual Y-axis")
             return False
 
         # 計算每個訊號的數值範圍
-        ranges = {}
-        for signal_name, data in signal_data.items():
-            if data:
-                values = [v for _, v in data]
-                value_min = min(values)
-                value_max = max(values)
-                value_range = value_max - value_min
-                ranges[signal_name] = (value_min, value_max)
-                if verbose_log:
-                    logger.info(f"📊 Signal {signal_name}: min={value_min:.3f}, max={value_max:.3f}, range={value_range:.3f}")
-
-        if len(ranges) < 2:
+        names = [name for name, (_, values) in signal_data.items() if values.size]
+        if len(names) < 2:
             if verbose_log:
-                logger.info(f"Valid signal ranges < 2, not using dual Y-axis")
+                logger.debug(f"Valid signal ranges < 2, not using dual Y-axis")
             return False
 
+        bounds = np.array([_min_max(signal_data[name][1]) for name in names])
+        mins = bounds[:, 0]
+        maxs = bounds[:, 1]
+        if verbose_log:
+            for name, value_min, value_max in zip(names, mins, maxs):
+                logger.debug(f"📊 Signal {name}: min={value_min:.3f}, max={value_max:.3f}, range={value_max - value_min:.3f}")
+
         # 計算全局範圍（所有訊號合併後的範圍）
-        global_min = min(r[0] for r in ranges.values())
-        global_max = max(r[1] for r in ranges.values())
+        global_min = mins.min()
+        global_max = maxs.max()
         global_range = global_max - global_min
 
         if verbose_log:
-            logger.info(f"📊 Global range: min={global_min:.3f}, max={global_max:.3f}, range={global_range:.3f}")
+            logger.debug(f"📊 Global range: min={global_min:.3f}, max={global_max:.3f}, range={global_range:.3f}")
 
         if global_range == 0:
             if verbose_log:
-                logger.info(f"Global range is 0, not using dual Y-axis")
+                logger.debug(f"Global range is 0, not using dual Y-axis")
             return False
 
         # 檢查每個訊號的範圍佔全局範圍的比例
         # 如果某個訊號的範圍佔比太小（< 10%），則應該用雙 Y 軸避免被壓縮
-        for signal_name, (vmin, vmax) in ranges.items():
-            signal_range = vmax - vmin
-            ratio = signal_range / global_range
-            if verbose_log:
-                logger.info(f"📊 Signal {signal_name} range ratio: {ratio*100:.1f}%")
-
-            if ratio < 0.1:  # 佔比小於 10%
-                if verbose_log:
-                    logger.info(f"✅ Enabling dual Y-axis: signal {signal_name} range ratio only {ratio*100:.1f}%, would be compressed")
-                return True
+        ratios = (maxs - mins) / global_range
+        compressed = ratios < 0.1  # 佔比小於 10%
 
         if verbose_log:
-            logger.info(f"❌ Not using dual Y-axis: all signal range ratios >= 10%")
-        return False
+            for name, ratio in zip(names, ratios):
+                logger.debug(f"📊 Signal {name} range ratio: {ratio*100:.1f}%")
+            if compressed.any():
+                idx = int(compressed.argmax())
+                logger.debug(f"✅ Enabling dual Y-axis: signal {names[idx]} range ratio only {ratios[idx]*100:.1f}%, would be compressed")
+            else:
+                logger.debug(f"❌ Not using dual Y-axis: all signal range ratios >= 10%")
+
+        return bool(compressed.any())
 
     def update_charts(self):
         """更新圖表內容"""
@@ -372,7 +484,9 @@ class ChartWidget(QWidget):
             return
 
         if not self.db_manager or not self.current_segment_id or not self.selected_signals:
-            self.plot_widget.clear()
+            self._remove_curves(self._curves, self.plot_widget)
+            self._remove_curves(self._right_curves, self.viewbox_right)
+            self._hide_right_viewbox()
             return
 
         try:
@@ -387,19 +501,7 @@ class ChartWidget(QWidget):
             if self.segment_end_time_ns is not None:
                 end_time_ns = min(end_time_ns, self.segment_end_time_ns)
 
-            # 清空圖表
-            self.plot_widget.clear()
-
-            # 移除舊的右側 ViewBox（如果存在）
-            if self.viewbox_right is not None:
-                self.plot_widget.getPlotItem().scene().removeItem(self.viewbox_right)
-                self.viewbox_right = None
-
-            # 重新加入所有永久元素
-            self.plot_widget.addItem(self.vline, ignoreBounds=True)  # 紅色垂直線不影響範圍
-            self.plot_widget.addItem(self.crosshair_v, ignoreBounds=True)
-            self.plot_widget.addItem(self.crosshair_h, ignoreBounds=True)
-            self.plot_widget.addItem(self.label, ignoreBounds=True)
+            # 不清空圖表：垂直線、十字線、標籤永久保留，曲線以 setData 更新
 
             # 清空存儲的資料
             self.plot_data = {}
@@ -409,31 +511,38 @@ class ChartWidget(QWidget):
                 self.current_segment_id,
                 self.selected_signals,  # 傳入列表
                 start_time_ns,
-                end_time_ns
+                end_time_ns,
+                limit=self.MAX_SAMPLES_PER_SIGNAL
             )
 
+            # 每個像素寬的時間區間，樣本數超過像素數 4 倍時以 M4 降採樣
+            pixel_width = max(1, self.plot_widget.width())
+            bucket_ns = max(1, (end_time_ns - start_time_ns) // pixel_width)
+
             # 轉換資料格式
             all_signal_data = {}
             for signal_name, data in all_data.items():
                 if data:
-                    # 轉換為相對時間 (秒，相對於當前時間)，並過濾 None 值
-                    times = []
-                    values = []
-                    raw_data = []  # 存儲原始資料 (time_ns, value)
-                    for row in data:
-                        if row[1] is not None:
-                            times.append((row[0] - self.current_time_ns) / 1e9)
-                            values.append(row[1])
-                            raw_data.append((row[0], row[1]))
-
-                    if times and values:
+                    # 拆成時間 (int64，保留 ns 精度) 與數值 (float64) 兩個陣列，
+                    # None 值轉為 NaN 後以遮罩過濾
+                    time_col, value_col = zip(*data)
+                    values = np.array(value_col, dtype=np.float64)
+                    mask = ~np.isnan(values)
+                    time_ns = np.array(time_col, dtype=np.int64)[mask]
+                    values = values[mask]
+
+                    if values.size:
+                        plot_time_ns, plot_values = time_ns, values
+                        if values.size > 4 * pixel_width:
+                            plot_time_ns, plot_values = _m4_downsample(time_ns, values, start_time_ns, bucket_ns)
+
                         all_signal_data[signal_name] = {
-                            'times': times,
-                            'values': values,
-                            'raw_data': raw_data
+                            # 相對時間 (秒，相對於當前時間)
+                            'times': self._relative_times(signal_name, plot_time_ns),
+                            'values': plot_values,
                         }
                         # 存儲原始資料供 hover 使用
-                        self.plot_data[signal_name] = raw_data
+                        self.plot_data[signal_name] = (time_ns, values)
 
             # 判斷是否使用雙 Y 軸
             use_dual = self._should_use_dual_y_axis(self.plot_data)
@@ -448,18 +557,80 @@ class ChartWidget(QWidget):
             # 設定 X 軸範圍
             self._set_x_axis_range()
 
+            self._last_drawn_time_ns = self.current_time_ns
+
         except Exception as e:
             logger.error(f"Failed to update charts: {e}")
 
+    def _relative_times(self, signal_name: str, time_ns):
+        """
+        將 time_ns 轉為相對當前時間的秒數，寫入該訊號的緩衝區
+
+        緩衝區只在樣本數超過容量時才重新配置。曲線的 setData 不複製陣列，
+        但每次寫入後都會立即以新資料呼叫 setData，因此可安全重複使用。
+
+        Args:
+            signal_name: 訊號名稱
+            time_ns: 時間陣列 (ns)
+
+        Returns:
+            np.ndarray: 相對時間 (秒)，為緩衝區的前 len(time_ns) 個元素
+        """
+        n = len(time_ns)
+        buf = self._time_buffers.get(signal_name)
+        if buf is None or len(buf) < n:
+            buf = np.empty(max(n, 2 * len(buf)) if buf is not None else n, dtype=np.float64)
+            self._time_buffers[signal_name] = buf
+
+        out = buf[:n]
+        np.subtract(time_ns, self.current_time_ns, out=out)
+        out *= 1e-9
+        return out
+
+    def _update_curve(self, curves: Dict, owner, signal_name: str, data: Dict):
+        """
+        更新（必要時建立）訊號的曲線
+
+        Args:
+            curves: 曲線快取 {signal_name: PlotDataItem}
+            owner: 曲線所屬的 PlotWidget 或 ViewBox
+            signal_name: 訊號名稱
+            data: {'times': [...], 'values': [...]}
+        """
+        curve = curves.get(signal_name)
+        if curve is None:
+            color = self.signal_colors.get(signal_name, '#000000')
+            # 由 pyqtgraph 依可見範圍裁切並以 peak 降採樣；資料已過濾 NaN，略過有限值檢查
+            curve = pg.PlotDataItem(pen=pg.mkPen(color=color, width=_CURVE_PEN_WIDTH), name=signal_name,
+                                    clipToView=True, autoDownsample=True, downsampleMethod='peak',
+                                    skipFiniteCheck=True)
+            owner.addItem(curve)
+            curves[signal_name] = curve
+        curve.setData(data['times'], data['values'])
+
+    def _remove_curves(self, curves: Dict, owner, keep=()):
+        """移除不在 keep 中的曲線"""
+        for signal_name in [name for name in curves if name not in keep]:
+            owner.removeItem(curves.pop(signal_name))
+
+    def _hide_right_viewbox(self):
+        """隱藏右側 Y 軸（保留 ViewBox 與曲線物件，只清空曲線資料）"""
+        if not self.viewbox_right.isVisible():
+            return
+        for curve in self._right_curves.values():
+            curve.setData([], [])
+        self.viewbox_right.hide()
+        self.plot_widget.showAxis('right', False)
+
     def _plot_with_single_y_axis(self, signal_data: Dict):
         """使用單 Y 軸繪製所有訊號"""
-        for signal_name, data in signal_data.items():
-            color = self.signal_colors.get(signal_name, '#000000')
-            pen = pg.mkPen(color=color, width=2)
-            self.plot_widget.plot(data['times'], data['values'], pen=pen, name=signal_name)
+        # 右側曲線可能正是要移到左側的訊號，先移除
+        self._remove_curves(self._right_curves, self.viewbox_right)
+        self._hide_right_viewbox()
+        self._remove_curves(self._curves, self.plot_widget, keep=signal_data)
 
-        # 隱藏右側 Y 軸
-        self.plot_widget.showAxis('right', False)
+        for signal_name, data in signal_data.items():
+            self._update_curve(self._curves, self.plot_widget, signal_name, data)
 
     def _plot_with_dual_y_axis(self, signal_data: Dict):
         """使用雙 Y 軸繪製訊號"""
@@ -468,8 +639,8 @@ class ChartWidget(QWidget):
         # 計算每個訊號的數值範圍，找出範圍最大的訊號
         ranges = {}
         for name, data in signal_data.items():
-            values = data['values']
-            ranges[name] = max(values) - min(values)
+            value_min, value_max = _min_max(data['values'])
+            ranges[name] = float(value_max - value_min)
 
         # 將範圍最大的訊號放在左側 Y 軸，其他放在右側
         sorted_signals = sorted(signal_names, key=lambda x: ranges[x], reverse=True)
@@ -477,30 +648,23 @@ class ChartWidget(QWidget):
         right_signals = sorted_signals[1:]
 
         # 繪製左側 Y 軸的訊號
+        self._remove_curves(self._curves, self.plot_widget, keep=left_signals)
         for signal_name in left_signals:
-            data = signal_data[signal_name]
-            color = self.signal_colors.get(signal_name, '#000000')
-            pen = pg.mkPen(color=color, width=2)
-            self.plot_widget.plot(data['times'], data['values'], pen=pen, name=signal_name)
+            self._update_curve(self._curves, self.plot_widget, signal_name, signal_data[signal_name])
 
         # 設定左側 Y 軸標籤
         if len(left_signals) == 1:
             self.plot_widget.setLabel('left', left_signals[0], color='k')
 
-        # 創建右側 Y 軸
-        self.viewbox_right = pg.ViewBox()
-        self.plot_widget.showAxis('right')
-        self.plot_widget.scene().addItem(self.viewbox_right)
-        self.plot_widget.getPlotItem().getAxis('right').linkToView(self.viewbox_right)
-        self.viewbox_right.setXLink(self.plot_widget.getPlotItem())
+        # 顯示右側 Y 軸
+        if not self.viewbox_right.isVisible():
+            self.viewbox_right.show()
+            self.plot_widget.showAxis('right')
 
         # 繪製右側 Y 軸的訊號
+        self._remove_curves(self._right_curves, self.viewbox_right, keep=right_signals)
         for signal_name in right_signals:
-            data = signal_data[signal_name]
-            color = self.signal_colors.get(signal_name, '#000000')
-            pen = pg.mkPen(color=color, width=2)
-            curve = pg.PlotCurveItem(data['times'], data['values'], pen=pen, name=signal_name)
-            self.viewbox_right.addItem(curve)
+            self._update_curve(self._right_curves, self.viewbox_right, signal_name, signal_data[signal_name])
 
         # 設定右側 Y 軸標籤
         if len(right_signals) == 1:
@@ -508,19 +672,6 @@ class ChartWidget(QWidget):
         else:
             self.plot_widget.setLabel('right', f'{len(right_signals)} 個訊號', color='k')
 
-        # 同步更新右側 ViewBox 的大小
-        def update_views():
-            # 檢查 viewbox_right 是否存在（防止切換到單 Y 軸後仍觸發此函數）
-            if self.viewbox_right is not None:
-                self.viewbox_right.setGeometry(self.plot_widget.getPlotItem().vb.sceneBoundingRect())
-                self.viewbox_right.linkedViewChanged(self.plot_widget.getPlotItem().vb, self.viewbox_right.XAxis)
-
-        update_views()
-        self.plot_widget.getPlotItem().vb.sigResized.connect(update_views)
-
-        # 啟用右側 Y 軸的自動範圍
-        self.viewbox_right.enableAutoRange(axis=pg.ViewBox.YAxis)
-
     def _set_x_axis_range(self):
         """設定 X 軸範圍"""
         # 計算實際的 X 軸範圍（基於實際數據範圍）
@@ -542,24 +693,25 @@ class ChartWidget(QWidget):
             if time_to_end < 10:
                 x_max = time_to_end
 
-        # 診斷日誌：輸出 X 軸範圍計算
-        logger.info(f"📐 X-axis range calculation:")
-        logger.info(f"   current_time_ns: {self.current_time_ns}")
-        logger.info(f"   segment_start_time_ns: {self.segment_start_time_ns}")
-        logger.info(f"   segment_end_time_ns: {self.segment_end_time_ns}")
-        logger.info(f"   actual_data_end_time_ns: {self.actual_data_end_time_ns}")
-        logger.info(f"   effective_end_time_ns: {effective_end_time_ns}")
-        if self.segment_start_time_ns:
-            logger.info(f"   time_from_start: {(self.current_time_ns - self.segment_start_time_ns) / 1e9:.2f} 秒")
-        if effective_end_time_ns:
-            logger.info(f"   time_to_end: {(effective_end_time_ns - self.current_time_ns) / 1e9:.2f} 秒")
-        logger.info(f"   x_min: {x_min:.2f}, x_max: {x_max:.2f}")
+        # 診斷日誌：輸出 X 軸範圍計算（每次更新都會執行，只在 DEBUG 時格式化）
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📐 X-axis range calculation:")
+            logger.debug(f"   current_time_ns: {self.current_time_ns}")
+            logger.debug(f"   segment_start_time_ns: {self.segment_start_time_ns}")
+            logger.debug(f"   segment_end_time_ns: {self.segment_end_time_ns}")
+            logger.debug(f"   actual_data_end_time_ns: {self.actual_data_end_time_ns}")
+            logger.debug(f"   effective_end_time_ns: {effective_end_time_ns}")
+            if self.segment_start_time_ns:
+                logger.debug(f"   time_from_start: {(self.current_time_ns - self.segment_start_time_ns) / 1e9:.2f} 秒")
+            if effective_end_time_ns:
+                logger.debug(f"   time_to_end: {(effective_end_time_ns - self.current_time_ns) / 1e9:.2f} 秒")
+            logger.debug(f"   x_min: {x_min:.2f}, x_max: {x_max:.2f}")
 
         # 設定 X 軸範圍（padding=0 確保精確範圍，不會有額外空間）
         self.plot_widget.setXRange(x_min, x_max, padding=0)
 
     def on_mouse_moved(self, pos):
-        """滑鼠移動事件處理"""
+        """滑鼠移動事件處理（節流至螢幕更新率，實際處理在 _do_hover_update）"""
         if not PYQTGRAPH_AVAILABLE:
             return
 
@@ -567,16 +719,25 @@ class ChartWidget(QWidget):
         if self.is_playing:
             return
 
+        self._pending_hover_pos = pos
+        if not self._hover_timer.isActive():
+            screen = self.screen()
+            refresh_rate = screen.refreshRate() if screen else 60.0
+            self._hover_timer.start(max(16, int(1000 / refresh_rate)) if refresh_rate > 0 else 16)
+
+    def _do_hover_update(self):
+        """更新十字線與數值標籤（使用最後一次的滑鼠位置）"""
+        pos = self._pending_hover_pos
+        self._pending_hover_pos = None
+        if pos is None or self.is_playing:
+            return
+
         try:
             vb = self.plot_widget.plotItem.vb
             if vb.sceneBoundingRect().contains(pos):
                 mouse_point = vb.mapSceneToView(pos)
                 x = mouse_point.x()  # 相對時間（秒）
 
-                # 更新十字線位置（只顯示垂直線）
-                self.crosshair_v.setPos(x)
-                self.crosshair_h.setVisible(False)
-
                 # 計算絕對時間
                 hover_time_ns = self.current_time_ns + int(x * 1e9)
 
@@ -585,7 +746,6 @@ class ChartWidget(QWidget):
 
                 # 顯示完整時間
                 if self.segment_start_timestamp:
-                    from datetime import datetime
                     # 計算實際時間
                     offset_from_segment_start = (hover_time_ns - self.segment_start_time_ns) / 1e9
                     actual_timestamp = self.segment_start_timestamp + offset_from_segment_start
@@ -597,31 +757,34 @@ class ChartWidget(QWidget):
                 label_lines.append(f"<b>{time_str}</b>")
 
                 # 查找所有訊號在該時間點的數值
-                for signal_name, data in self.plot_data.items():
-                    # 找最接近的點
-                    closest_value = None
-                    min_diff = float('inf')
-                    for time_ns, value in data:
-                        diff = abs(time_ns - hover_time_ns)
-                        if diff < min_diff:
-                            min_diff = diff
-                            closest_value = value
-
-                    if closest_value is not None and min_diff < 1e9:  # 1秒內
+                for signal_name, (time_ns, values) in self.plot_data.items():
+                    # 找最接近的點（time_ns 已依時間排序，二分搜尋後比較左右相鄰兩點）
+                    idx = int(np.searchsorted(time_ns, hover_time_ns))
+                    if idx > 0 and (idx == len(time_ns) or
+                                    hover_time_ns - time_ns[idx - 1] <= time_ns[idx] - hover_time_ns):
+                        idx -= 1
+                    closest_value = float(values[idx])
+                    min_diff = abs(time_ns[idx] - hover_time_ns)
+
+                    if min_diff < 1e9:  # 1秒內
                         color = self.signal_colors.get(signal_name, '#000000')
                         label_lines.append(f"<span style='color: {color};'>{signal_name}: {closest_value:.3f}</span>")
 
-                # 組合標籤
-                if len(label_lines) > 1:
-                    label_text = "<div style='background-color: rgba(255, 255, 255, 200); padding: 4px; border: 1px solid black;'>" + "<br>".join(label_lines) + "</div>"
-                else:
-                    label_text = f"<div style='background-color: rgba(255, 255, 255, 200); padding: 4px; border: 1px solid black;'><b>{time_str}</b></div>"
-
-                # 設定 label 位置（使用滑鼠 Y 座標）
-                y = mouse_point.y()
+                # 標籤內容算好後才更新十字線與標籤（場景會將這些變更合併為一次重繪）
+                # 更新十字線位置（只顯示垂直線）
+                self.crosshair_v.setPos(x)
 
-                self.label.setHtml(label_text)
-                self.label.setPos(x, y)  # 跟隨滑鼠位置
+                # 組合標籤（內容與上次相同時不重新排版，只移動位置）
+                if label_lines != self._last_label_lines:
+                    if len(label_lines) > 1:
+                        self.label.setHtml(self._LABEL_HTML_OPEN + "<br>".join(label_lines) + self._LABEL_HTML_CLOSE)
+                    else:
+                        # 只有時間時使用純文字，不需 rich text 排版
+                        self.label.setText(time_str)
+                    self._last_label_lines = label_lines
+
+                # 設定 label 位置（跟隨滑鼠位置）
+                self.label.setPos(x, mouse_point.y())
                 self.label.setVisible(True)
             else:
                 # 滑鼠移出圖表範圍，隱藏十字線
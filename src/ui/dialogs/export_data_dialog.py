@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-Export Data Dialog - Export signal data to CSV or Parquet
+Export Data Dialog - Export signal data to CSV, Parquet or Feather
 """
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
@@ -12,82 +12,171 @@ from PyQt6.QtGui import QFont
 import logging
 from typing import List, Dict
 import csv
+import io
+import time
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+
+# Optional: pyarrow writes CSV rows with its C++ writer (and is required for Parquet)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_first = itemgetter(0)
+_second = itemgetter(1)
+
+
+def _align_signals(all_data: Dict[str, list], signal_names: List[str]):
+    """
+    Align per-signal samples on one shared, sorted timeline
+
+    Each signal's samples are already sorted by time, so its positions on the
+    timeline come from one np.searchsorted call and are scattered into a
+    NaN-filled column (NaN = no sample / None value). A signal with values
+    that are not numbers keeps them in an object column (None = no sample).
+
+    Args:
+        all_data: {signal_name: [(time_ns, value), ...]}
+        signal_names: Column order
+
+    Returns:
+        (timeline, columns): int64 time_ns array and one array per signal
+        (float64, or object for non-numeric signals)
+    """
+    series = []
+    for signal_name in signal_names:
+        data = all_data.get(signal_name)
+        if data:
+            # Columns are read straight out of the row tuples: zip(*data) builds
+            # two huge tuples, and the allocations trigger full GC passes over
+            # all fetched rows
+            times = np.fromiter(map(_first, data), dtype=np.int64, count=len(data))
+            try:
+                values = np.fromiter(map(_second, data), dtype=np.float64, count=len(data))
+            except (TypeError, ValueError):
+                values = np.array(list(map(_second, data)), dtype=object)
+            series.append((times, values))
+        else:
+            series.append((np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)))
+
+    # Shared timeline: the concatenation is N sorted runs, which the stable
+    # sort (timsort) merges run by run instead of fully re-sorting; then
+    # drop repeated times
+    timeline = np.concatenate([times for times, _ in series])
+    timeline.sort(kind='stable')
+    if timeline.size:
+        is_new = np.empty(timeline.size, dtype=bool)
+        is_new[0] = True
+        np.not_equal(timeline[1:], timeline[:-1], out=is_new[1:])
+        timeline = timeline[is_new]
+
+    columns = []
+    for times, values in series:
+        if values.dtype == object:
+            column = np.full(timeline.size, None, dtype=object)
+        else:
+            column = np.full(timeline.size, np.nan)
+        column[np.searchsorted(timeline, times)] = values
+        columns.append(column)
+
+    return timeline, columns
+
+
+def _relative_time_array(times, segment_start_time_ns: int):
+    """
+    relative_time_s as an Arrow decimal(38, 6) array
+
+    Built from the rounded microsecond offsets as unscaled 128-bit integers,
+    so Arrow's CSV writer prints exactly six decimals ("%.6f") in C instead
+    of formatting one Python string per row.
+    """
+    micros = np.rint((times - segment_start_time_ns) / 1e3).astype(np.int64)
+    words = np.empty((micros.size, 2), dtype=np.int64)  # little-endian low, high word
+    words[:, 0] = micros
+    words[:, 1] = micros >> 63  # sign extension
+    return pa.Array.from_buffers(pa.decimal128(38, 6), micros.size, [None, pa.py_buffer(words)])
+
 
 class ExportWorker(QThread):
     """Export data worker thread"""
     progress = pyqtSignal(int, str)  # Progress percentage, status message
     finished = pyqtSignal(bool, str)  # Success status, message
 
+    # Rows formatted per CSV write
+    CSV_BATCH_ROWS = 1024
+
+    # Rows converted to Arrow columns per CSV write (pyarrow path)
+    CSV_ARROW_CHUNK_ROWS = 64_000
+
+    # Minimum seconds between write progress signals
+    PROGRESS_INTERVAL_S = 0.1
+
     def __init__(self, db_manager, segment_id, signal_names, time_range,
-                 export_path, export_format):
+                 export_path, export_format, row_group_size=64_000):
         super().__init__()
         self.db_manager = db_manager
         self.segment_id = segment_id
         self.signal_names = signal_names
         self.time_range = time_range  # (start_ns, end_ns) or None for all
         self.export_path = export_path
-        self.export_format = export_format  # 'csv' or 'parquet'
+        self.export_format = export_format  # 'csv', 'parquet' or 'feather'
+        self.row_group_size = row_group_size  # Rows per Parquet row group / Feather batch (written one at a time)
+        self._last_progress_time = 0.0
 
     def run(self):
         """Execute export"""
         try:
             self.progress.emit(0, "準備匯出資料...")
 
-            # Get segment info
-            segment = self.db_manager.get_segment_by_id(self.segment_id)
+            # Get segment info (segment start and data time range)
+            segment = self.db_manager.get_segment_meta(self.segment_id)
             if not segment:
                 self.finished.emit(False, "找不到 Segment 資料")
                 return
 
             segment_start_time_ns = segment['start_time_ns']
+            start_time_ns, end_time_ns = self.time_range or (segment['data_start_ns'], segment['data_end_ns'])
 
             self.progress.emit(10, f"查詢 {len(self.signal_names)} 個訊號資料...")
 
-            # Query data
+            # Query signal by signal: each one is a single covering-index range
+            # already in time order, so no sort or regrouping of the combined rows
             all_data = {}
-            for i, signal_name in enumerate(self.signal_names):
-                # Get signal data
-                data = self.db_manager.get_signal_data(
-                    self.segment_id,
-                    signal_name,
-                    self.time_range[0] if self.time_range else None,
-                    self.time_range[1] if self.time_range else None
-                )
-
-                all_data[signal_name] = data
-
-                # Update progress
-                progress_pct = 10 + int((i + 1) / len(self.signal_names) * 40)
-                self.progress.emit(progress_pct, f"已查詢 {i+1}/{len(self.signal_names)} 個訊號")
+            if start_time_ns is not None:
+                total = len(self.signal_names)
+                for i, signal_name in enumerate(self.signal_names, 1):
+                    all_data[signal_name] = self.db_manager.get_timeseries_data(
+                        self.segment_id, signal_name, start_time_ns, end_time_ns
+                    )
+                    self.progress.emit(10 + int(i / total * 40), f"查詢訊號資料... {i}/{total}")
 
             self.progress.emit(50, "整理資料格式...")
 
-            # Find all unique time points
-            all_times = set()
-            for signal_data in all_data.values():
-                for time_ns, _ in signal_data:
-                    all_times.add(time_ns)
+            timeline, columns = _align_signals(all_data, self.signal_names)
 
-            sorted_times = sorted(all_times)
-
-            if not sorted_times:
+            if not timeline.size:
                 self.finished.emit(False, "沒有資料可以匯出")
                 return
 
-            self.progress.emit(60, f"準備匯出 {len(sorted_times)} 筆資料...")
+            self.progress.emit(60, f"準備匯出 {timeline.size} 筆資料...")
 
             # Export based on format
             if self.export_format == 'csv':
-                self._export_csv(all_data, sorted_times, segment_start_time_ns)
+                self._export_csv(timeline, columns, segment_start_time_ns)
             elif self.export_format == 'parquet':
-                self._export_parquet(all_data, sorted_times, segment_start_time_ns)
+                self._export_parquet(timeline, columns, segment_start_time_ns)
+            elif self.export_format == 'feather':
+                self._export_feather(timeline, columns, segment_start_time_ns)
 
             self.progress.emit(100, "匯出完成！")
-            self.finished.emit(True, f"成功匯出 {len(sorted_times)} 筆資料")
+            self.finished.emit(True, f"成功匯出 {timeline.size} 筆資料")
 
         except Exception as e:
             logger.error(f"Export data failed: {e}")
@@ -95,78 +184,175 @@ class ExportWorker(QThread):
             logger.error(traceback.format_exc())
             self.finished.emit(False, f"匯出失敗: {str(e)}")
 
-    def _export_csv(self, all_data, sorted_times, segment_start_time_ns):
+    def _export_csv(self, timeline, columns, segment_start_time_ns):
         """Export to CSV format"""
         self.progress.emit(70, "寫入 CSV 檔案...")
 
-        with open(self.export_path, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
+        # Header row is formatted by the csv module on both paths (same quoting)
+        header = io.StringIO()
+        csv.writer(header).writerow(['time_ns', 'relative_time_s'] + self.signal_names)
 
-            # Write header row
-            header = ['time_ns', 'relative_time_s'] + self.signal_names
-            writer.writerow(header)
+        # Numeric columns are formatted by Arrow; text values need the csv
+        # module's quoting
+        if PYARROW_AVAILABLE and all(column.dtype != object for column in columns):
+            with open(self.export_path, 'wb') as f:
+                f.write(header.getvalue().encode('utf-8-sig'))
+                self._write_csv_rows_arrow(f, timeline, columns, segment_start_time_ns)
+        else:
+            with open(self.export_path, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as f:
+                f.write(header.getvalue())
+                self._write_csv_rows(f, timeline, columns, segment_start_time_ns)
 
-            # Create time->value mapping for each signal
-            signal_maps = {}
-            for signal_name, data in all_data.items():
-                signal_maps[signal_name] = {time_ns: value for time_ns, value in data}
+        logger.info(f"CSV export complete: {self.export_path}")
 
-            # Write data rows
-            total = len(sorted_times)
-            for i, time_ns in enumerate(sorted_times):
-                relative_time_s = (time_ns - segment_start_time_ns) / 1e9
+    def _emit_write_progress(self, done, total):
+        """Report write progress, at most once per PROGRESS_INTERVAL_S (and always at the end)"""
+        now = time.monotonic()
+        if done < total and now - self._last_progress_time < self.PROGRESS_INTERVAL_S:
+            return
+        self._last_progress_time = now
+        self.progress.emit(70 + int(done / total * 25), f"寫入中... {done}/{total}")
+
+    def _write_csv_rows(self, f, timeline, columns, segment_start_time_ns):
+        """Write CSV data rows with the csv module"""
+        # Rows are formatted into an in-memory buffer and written to the
+        # file one batch at a time instead of one small write per row
+        scratch = io.StringIO()
+        writer = csv.writer(scratch)
+
+        total = timeline.size
+        for start in range(0, total, self.CSV_BATCH_ROWS):
+            end = start + self.CSV_BATCH_ROWS
+            # Back to Python values, NaN (no sample) -> ''
+            value_lists = []
+            for column in columns:
+                if column.dtype == object:
+                    # None (no sample) is written as '' by the csv module
+                    value_lists.append(column[start:end].tolist())
+                    continue
+                values = column[start:end].astype(object)
+                values[np.isnan(column[start:end])] = ''
+                value_lists.append(values.tolist())
+
+            times = timeline[start:end]
+            relative_times = [f"{relative_time_s:.6f}"
+                              for relative_time_s in ((times - segment_start_time_ns) / 1e9).tolist()]
+
+            # zip yields each row as one ready-made tuple
+            writer.writerows(zip(times.tolist(), relative_times, *value_lists))
+            f.write(scratch.getvalue())
+            scratch.seek(0)
+            scratch.truncate(0)
+
+            # Update progress
+            done = start + times.size
+            self._emit_write_progress(done, total)
+
+    def _write_csv_rows_arrow(self, f, timeline, columns, segment_start_time_ns):
+        """Write CSV data rows with pyarrow's C++ CSV writer, one chunk of columns at a time"""
+        schema = pa.schema(
+            [('time_ns', pa.int64()), ('relative_time_s', pa.decimal128(38, 6))]
+            + [(signal_name, pa.float64()) for signal_name in self.signal_names]
+        )
+        # Only numbers are written, nothing needs quoting
+        options = pa_csv.WriteOptions(include_header=False, eol='\r\n', quoting_style='none')
 
-                row = [time_ns, f"{relative_time_s:.6f}"]
-                for signal_name in self.signal_names:
-                    value = signal_maps[signal_name].get(time_ns, '')
-                    row.append(value if value != '' else '')
+        total = timeline.size
+        with pa_csv.CSVWriter(f, schema, write_options=options) as writer:
+            for start in range(0, total, self.CSV_ARROW_CHUNK_ROWS):
+                end = start + self.CSV_ARROW_CHUNK_ROWS
+                times = timeline[start:end]
+                arrays = [pa.array(times), _relative_time_array(times, segment_start_time_ns)]
 
-                writer.writerow(row)
+                # Missing samples are nulls, written as ''
+                for column in columns:
+                    values = column[start:end]
+                    arrays.append(pa.array(values, mask=np.isnan(values)))
 
-                # Update progress
-                if i % 1000 == 0:
-                    progress_pct = 70 + int((i + 1) / total * 25)
-                    self.progress.emit(progress_pct, f"寫入中... {i+1}/{total}")
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
 
-        logger.info(f"CSV export complete: {self.export_path}")
+                # Update progress
+                done = min(start + self.CSV_ARROW_CHUNK_ROWS, total)
+                self._emit_write_progress(done, total)
 
-    def _export_parquet(self, all_data, sorted_times, segment_start_time_ns):
+    def _export_parquet(self, timeline, columns, segment_start_time_ns):
         """Export to Parquet format"""
         try:
-            import pandas as pd
-            import pyarrow as pa
             import pyarrow.parquet as pq
         except ImportError as e:
             raise ImportError(
-                "需要安裝 pandas 和 pyarrow 才能匯出 Parquet 格式\n"
-                "請執行: pip install pandas pyarrow"
+                "需要安裝 pyarrow 才能匯出 Parquet 格式\n"
+                "請執行: pip install pyarrow"
             ) from e
 
-        self.progress.emit(70, "準備 DataFrame...")
+        schema = self._arrow_schema(columns)
+
+        # Write one row group at a time, so only one chunk of Arrow columns is in memory
+        # Signal values are continuous floats (dictionary encoding rarely pays
+        # off), time_ns is monotonic (delta encoding); min/max statistics are
+        # not needed for an export file and cost a scan per column
+        with pq.ParquetWriter(self.export_path, schema,
+                              compression='snappy',
+                              use_dictionary=False,
+                              column_encoding={'time_ns': 'DELTA_BINARY_PACKED'},
+                              data_page_size=1 << 20,
+                              write_statistics=False) as writer:
+            for batch in self._record_batches(timeline, columns, segment_start_time_ns, schema):
+                writer.write_batch(batch)
 
-        # Create data dictionary
-        data_dict = {
-            'time_ns': sorted_times,
-            'relative_time_s': [(t - segment_start_time_ns) / 1e9 for t in sorted_times]
-        }
+        logger.info(f"Parquet export complete: {self.export_path}")
 
-        # 為每個訊號建立時間->值的映射
-        signal_maps = {}
-        for signal_name, data in all_data.items():
-            signal_maps[signal_name] = {time_ns: value for time_ns, value in data}
+    def _export_feather(self, timeline, columns, segment_start_time_ns):
+        """Export to Feather (Arrow IPC) format"""
+        try:
+            import pyarrow.ipc as pa_ipc
+        except ImportError as e:
+            raise ImportError(
+                "需要安裝 pyarrow 才能匯出 Feather 格式\n"
+                "請執行: pip install pyarrow"
+            ) from e
 
-        # Fill data for each signal
-        for signal_name in self.signal_names:
-            signal_map = signal_maps[signal_name]
-            data_dict[signal_name] = [signal_map.get(t, None) for t in sorted_times]
+        schema = self._arrow_schema(columns)
 
-        self.progress.emit(80, "建立 DataFrame...")
-        df = pd.DataFrame(data_dict)
+        # Feather V2 is the Arrow IPC file format: batches are written as-is,
+        # without Parquet's page encoding or statistics; LZ4 buffer compression
+        # is cheaper than writing the raw float columns out
+        options = pa_ipc.IpcWriteOptions(compression='lz4')
+        with pa_ipc.new_file(self.export_path, schema, options=options) as writer:
+            for batch in self._record_batches(timeline, columns, segment_start_time_ns, schema):
+                writer.write_batch(batch)
 
-        self.progress.emit(90, "寫入 Parquet 檔案...")
-        df.to_parquet(self.export_path, compression='snappy', index=False)
+        logger.info(f"Feather export complete: {self.export_path}")
 
-        logger.info(f"Parquet export complete: {self.export_path}")
+    def _arrow_schema(self, columns):
+        """Arrow schema shared by the Parquet and Feather exports (non-numeric signals as strings)"""
+        return pa.schema(
+            [('time_ns', pa.int64()), ('relative_time_s', pa.float64())]
+            + [(signal_name, pa.string() if column.dtype == object else pa.float64())
+               for signal_name, column in zip(self.signal_names, columns)]
+        )
+
+    def _record_batches(self, timeline, columns, segment_start_time_ns, schema):
+        """Yield row_group_size-row record batches (NaN -> null), reporting progress"""
+        total = timeline.size
+        for start in range(0, total, self.row_group_size):
+            end = start + self.row_group_size
+            times = timeline[start:end]
+            arrays = [pa.array(times), pa.array((times - segment_start_time_ns) / 1e9)]
+
+            # Fill data for each signal (NaN / None -> null)
+            for column in columns:
+                values = column[start:end]
+                if column.dtype == object:
+                    arrays.append(pa.array([None if value is None else str(value) for value in values],
+                                           type=pa.string()))
+                else:
+                    arrays.append(pa.array(values, mask=np.isnan(values)))
+
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+            done = min(end, total)
+            self._emit_write_progress(done, total)
 
 
 class ExportDataDialog(QDialog):
@@ -211,6 +397,10 @@ class ExportDataDialog(QDialog):
         self.format_button_group.addButton(self.parquet_radio, 2)
         format_layout.addWidget(self.parquet_radio)
 
+        self.feather_radio = QRadioButton(t("Feather Format (Fastest read/write, larger file size)"))
+        self.format_button_group.addButton(self.feather_radio, 3)
+        format_layout.addWidget(self.feather_radio)
+
         layout.addWidget(format_group)
 
         # ============================================================
@@ -351,9 +541,12 @@ class ExportDataDialog(QDialog):
         if self.csv_radio.isChecked():
             filter_str = t("CSV Files (*.csv)")
             default_ext = ".csv"
-        else:
+        elif self.parquet_radio.isChecked():
             filter_str = t("Parquet Files (*.parquet)")
             default_ext = ".parquet"
+        else:
+            filter_str = t("Feather Files (*.feather)")
+            default_ext = ".feather"
 
         # Default filename
         segment = self.db_manager.get_segment_by_id(self.segment_id) if self.db_manager else None
@@ -400,7 +593,12 @@ class ExportDataDialog(QDialog):
             return
 
         # Get export format
-        export_format = 'csv' if self.csv_radio.isChecked() else 'parquet'
+        if self.csv_radio.isChecked():
+            export_format = 'csv'
+        elif self.parquet_radio.isChecked():
+            export_format = 'parquet'
+        else:
+            export_format = 'feather'
 
         # Get time range
         time_range = None  # None = all
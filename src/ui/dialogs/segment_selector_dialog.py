@@ -8,18 +8,43 @@ from PyQt6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QFileDialog,
     QLabel, QProgressBar, QHeaderView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
-from PyQt6.QtGui import QColor, QPixmap, QImage
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QSettings
+from PyQt6.QtGui import QColor, QPixmap, QPixmapCache, QImage, QImageReader
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import capnp
 import logging
 import av  # PyAV for video decoding
 import json
+import mmap
+import sys
+
+# Optional: orjson reads/writes the segment cache as UTF-8 bytes in C
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: hardware-accelerated video decoding (PyAV >= 14)
+try:
+    from av.codec.hwaccel import HWAccel, hwdevices_available
+    HWACCEL_AVAILABLE = True
+except ImportError:
+    HWACCEL_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Hardware decoders to try for thumbnails, per platform, in order of preference
+_HWACCEL_DEVICE_TYPES = {
+    'darwin': ('videotoolbox',),
+    'win32': ('d3d11va', 'cuda', 'dxva2'),
+}.get(sys.platform, ('cuda', 'vaapi'))
+
 # Load schema
 try:
     capnp_log = capnp.load('log.capnp')
@@ -28,18 +53,141 @@ except Exception as e:
     capnp_log = None
 
 
+def _scandir_recursive(root: Path, name: str = 'rlog') -> Iterator[os.DirEntry]:
+    """
+    Recursively find files named `name` under root
+
+    Walks with os.scandir, whose DirEntry carries the file type from the
+    directory listing, so no extra stat() per entry is needed (unlike
+    Path.rglob). Symlinked directories are not followed; unreadable
+    directories are skipped.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name == name and entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.debug(f"Cannot scan directory: {e}")
+
+
+def _route_segment_key(dir_name: str):
+    """(route_id, segment_number) from a segment directory name, None if not one
+
+    Directory format: 00000009--f5d34548e1--33 (route_id = dongle_id--route_hex,
+    consistent with segment_importer)
+    """
+    parts = dir_name.split('--')
+    if len(parts) != 3:
+        return None
+    try:
+        return f"{parts[0]}--{parts[1]}", int(parts[2])
+    except ValueError:
+        return None
+
+
+def _dir_name_fields(dir_name: str) -> Dict:
+    """Fields parsed from a segment directory name (stored in the scan cache)
+
+    Raises ValueError if dir_name isn't dongle_id--route_hex--segment_num.
+    """
+    dongle_id, route_hex, segment_num = dir_name.split('--')
+    return {
+        'segment_num': int(segment_num),
+        'route_hex': route_hex,
+        'dongle_id': dongle_id,
+        # Build route_id (format: dongle_id--route_hex, consistent with segment_importer)
+        'route_id': f"{dongle_id}--{route_hex}",
+    }
+
+
+def _format_timestamp(timestamp) -> Optional[str]:
+    """Display string for a unix timestamp, None if it can't be converted"""
+    try:
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _add_display_strings(seg_info: Dict) -> Dict:
+    """Preformat the table's time/size strings (done in the scanner thread)"""
+    gps_time = seg_info.get('gps_time')
+    wall_time = seg_info.get('wall_time')
+    seg_info['gps_time_str'] = _format_timestamp(gps_time) if gps_time else None
+    # Wall time is only shown when there's no GPS time
+    seg_info['wall_time_str'] = _format_timestamp(wall_time) if wall_time and not gps_time else None
+    seg_info['size_str'] = f"{(seg_info.get('file_size') or 0) / (1024 * 1024):.1f} MB"
+    return seg_info
+
+
+def _read_rlog_times(buffer) -> tuple:
+    """(gps_time, init_wall_time) from rlog bytes, in seconds (None if not found)
+
+    Events are decoded lazily, so only the part up to the first GPS fix is read.
+    All references into the buffer are released on return, so an mmap passed
+    in can be closed afterwards.
+    """
+    init_wall_time = None
+    for i, event in enumerate(capnp_log.Event.read_multiple_bytes(buffer)):
+        try:
+            which = event.which()
+            # Find first liveLocationKalman
+            if which == 'liveLocationKalman':
+                llk = event.liveLocationKalman
+                if hasattr(llk, 'unixTimestampMillis') and llk.unixTimestampMillis > 0:
+                    # GPS time (seconds) - this is segment's GPS time
+                    return int(llk.unixTimestampMillis / 1000), init_wall_time
+            # Fallback: initData wallTimeNanos in the first 100 events
+            elif which == 'initData' and i < 100 and init_wall_time is None:
+                wall_time_ns = event.initData.wallTimeNanos
+                if wall_time_ns > 0:
+                    init_wall_time = int(wall_time_ns / 1e9)
+        except:
+            pass
+    return None, init_wall_time
+
+
+class NumericItem(QTableWidgetItem):
+    """Table item sorted by the numeric value in UserRole instead of its text"""
+
+    def __lt__(self, other):
+        mine = self.data(Qt.ItemDataRole.UserRole)
+        theirs = other.data(Qt.ItemDataRole.UserRole)
+        # Items without a value (No GPS / "--") sort below every real value
+        if mine is None or theirs is None:
+            return mine is None and theirs is not None
+        return mine < theirs
+
+
 class SegmentScanner(QThread):
     """Background thread to scan segments and retrieve time information"""
     segment_found = pyqtSignal(dict)  # Found a segment
     scan_finished = pyqtSignal(int)  # Scan finished, parameter is total count
     cache_loaded = pyqtSignal(int)  # Cache loaded, parameter is item count
 
+    # Upper bound on parallel parse_segment workers (rlog read + capnp decode + thumbnail)
+    MAX_PARSE_WORKERS = 8
+
+    # Minimum seconds between cache writes while new segments are being parsed
+    CACHE_FLUSH_INTERVAL_S = 5.0
+
+    # Hardware device type for thumbnail decoding; None = software. Probed
+    # once per process and cleared if the device can't be opened
+    _hwaccel_device_type = None
+    _hwaccel_probed = False
+
     def __init__(self, root_dir: str, db_manager=None):
         super().__init__()
         self.root_dir = Path(root_dir)
         self.db_manager = db_manager
         self.running = True
         self.cache_file = self.root_dir / ".oplog_cache.json"
+        # Decoder threads per thumbnail; set from the parse worker count in run()
+        self.decode_threads = 1
 
     def stop(self):
         """Stop scanning"""
@@ -49,10 +197,10 @@ class SegmentScanner(QThread):
         """Load cache file"""
         try:
             if self.cache_file.exists():
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    logger.info(f"Loaded {len(cache_data)} segments from cache")
-                    return cache_data
+                raw = self.cache_file.read_bytes()
+                cache_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                logger.info(f"Loaded {len(cache_data)} segments from cache")
+                return cache_data
         except Exception as e:
             logger.warning(f"Failed to load cache: {e}")
         return []
@@ -66,6 +214,9 @@ class SegmentScanner(QThread):
                 cache_item = {
                     'dir_name': seg['dir_name'],
                     'segment_num': seg['segment_num'],
+                    'route_hex': seg.get('route_hex'),
+                    'route_id': seg.get('route_id'),
+                    'dongle_id': seg.get('dongle_id'),
                     'gps_time': seg.get('gps_time'),
                     'wall_time': seg.get('wall_time'),
                     'file_size': seg['file_size'],
@@ -73,8 +224,17 @@ class SegmentScanner(QThread):
                 }
                 cache_data.append(cache_item)
 
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # Compact JSON (the cache is only read by the scanner)
+            if ORJSON_AVAILABLE:
+                raw = orjson.dumps(cache_data)
+            else:
+                raw = json.dumps(cache_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+            # Write to a temporary file and swap it in, so an interrupted write
+            # never leaves a truncated cache behind
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(raw)
+            os.replace(tmp_file, self.cache_file)
             logger.info(f"Saved {len(cache_data)} segments to cache")
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
@@ -83,79 +243,123 @@ class SegmentScanner(QThread):
         """Scan all segments under root_dir"""
         # First try to load cache
         cached_segments = self.load_cache()
+        cache_upgraded = False  # Entries from an older cache gained parsed fields
         if cached_segments:
             for seg_info in cached_segments:
                 if not self.running:
                     return
-                # Load thumbnail from segment directory
+                if 'route_id' not in seg_info:
+                    try:
+                        seg_info.update(_dir_name_fields(seg_info['dir_name']))
+                        cache_upgraded = True
+                    except (KeyError, ValueError):
+                        pass
+                # Thumbnail in segment directory (loaded by the dialog when shown)
                 try:
                     rlog_path = Path(seg_info['path'])
                     segment_num = seg_info['segment_num']
                     thumbnail_file = rlog_path.parent / f"thumbnail_{segment_num}.jpg"
 
-                    if thumbnail_file.exists():
-                        seg_info['thumbnail'] = QPixmap(str(thumbnail_file))
-                    else:
-                        seg_info['thumbnail'] = None
+                    seg_info['thumbnail_path'] = str(thumbnail_file) if thumbnail_file.exists() else None
                 except Exception as e:
-                    logger.debug(f"Failed to load thumbnail from cache: {e}")
-                    seg_info['thumbnail'] = None
+                    logger.debug(f"Failed to find thumbnail from cache: {e}")
+                    seg_info['thumbnail_path'] = None
 
-                self.segment_found.emit(seg_info)
+                self.segment_found.emit(_add_display_strings(seg_info))
             self.cache_loaded.emit(len(cached_segments))
 
         # Then perform actual scan and update cache (only check for new segments)
         count = 0
         scanned_segments = []
+        dirty = cache_upgraded  # scanned_segments differs from the cache file
+        last_flush = time.monotonic()
 
         try:
-            # Build cache path set for quick lookup
-            cached_paths = set(s['path'] for s in cached_segments) if cached_segments else set()
+            # Index cache by path for O(1) lookup
+            cached_by_path = {s['path']: s for s in cached_segments}
 
             # Recursively search for all rlog files
-            for rlog_path in self.root_dir.rglob('rlog'):
+            new_entries = []
+            for entry in _scandir_recursive(self.root_dir):
                 if not self.running:
                     break
 
-                rlog_path_str = str(rlog_path)
+                rlog_path_str = entry.path
 
                 # Check if in cache
-                if rlog_path_str in cached_paths:
+                cached_seg = cached_by_path.get(rlog_path_str)
+                if cached_seg is not None:
                     # Already in cache, get data directly from cache (don't re-parse)
-                    for cached_seg in cached_segments:
-                        if cached_seg['path'] == rlog_path_str:
-                            scanned_segments.append(cached_seg)
-                            count += 1
-                            break
+                    scanned_segments.append(cached_seg)
+                    count += 1
                 else:
                     # New segment, needs parsing
-                    segment_info = self.parse_segment(rlog_path)
-                    if segment_info:
-                        self.segment_found.emit(segment_info)  # Display newly discovered segment
-                        scanned_segments.append(segment_info)
-                        count += 1
-                        logger.info(f"Found new segment: {segment_info['dir_name']}")
+                    new_entries.append(entry)
+            else:
+                # Full walk done: cached segments not found again were removed
+                dirty = dirty or count != len(cached_segments)
+
+            # Parse new segments in parallel (each one is independent); results
+            # are emitted from this thread as they complete
+            if new_entries and self.running:
+                # Times of already imported segments, looked up in one query
+                db_times = self._get_db_times([entry.path for entry in new_entries])
+
+                max_workers = min(self.MAX_PARSE_WORKERS, os.cpu_count() or 1, len(new_entries))
+                # Split the cores between the workers so concurrent decoders
+                # don't oversubscribe the CPU
+                self.decode_threads = max(1, (os.cpu_count() or 1) // max_workers)
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                try:
+                    futures = [executor.submit(self.parse_segment, entry, db_times) for entry in new_entries]
+                    for future in as_completed(futures):
+                        if not self.running:
+                            break
+                        try:
+                            segment_info = future.result()
+                        except Exception as e:
+                            logger.error(f"Error parsing segment: {e}")
+                            continue
+                        if segment_info:
+                            self.segment_found.emit(_add_display_strings(segment_info))  # Display newly discovered segment
+                            scanned_segments.append(segment_info)
+                            count += 1
+                            dirty = True
+                            logger.info(f"Found new segment: {segment_info['dir_name']}")
+
+                            # Long first scans save progress periodically
+                            now = time.monotonic()
+                            if now - last_flush >= self.CACHE_FLUSH_INTERVAL_S:
+                                self.save_cache(scanned_segments)
+                                dirty = False
+                                last_flush = now
+                finally:
+                    # On stop, drop segments that haven't started parsing
+                    executor.shutdown(wait=True, cancel_futures=True)
 
         except Exception as e:
             logger.error(f"Error scanning segments: {e}")
-
-        # Save updated cache (only update if there are changes)
-        if scanned_segments and (not cached_segments or len(scanned_segments) != len(cached_segments)):
-            self.save_cache(scanned_segments)
-            logger.info(f"Updated cache with {len(scanned_segments)} segments")
+        finally:
+            # Save updated cache (only update if there are changes)
+            if dirty and scanned_segments:
+                self.save_cache(scanned_segments)
+                logger.info(f"Updated cache with {len(scanned_segments)} segments")
 
         self.scan_finished.emit(count)
 
-    def _generate_and_save_thumbnail(self, segment_dir: Path, thumbnail_path: Path) -> Optional[QPixmap]:
+    def _generate_and_save_thumbnail(self, segment_dir: Path, thumbnail_path: Path) -> bool:
         """
         Generate thumbnail from video and save to file
 
+        Runs in parse worker threads, so it only uses QImage (QPixmap must
+        stay on the GUI thread).
+
         Args:
             segment_dir: Segment directory path
             thumbnail_path: Thumbnail save path
 
         Returns:
-            QPixmap thumbnail, None if failed
+            True if the thumbnail file was saved
         """
         try:
             # Try fcamera (front view) first, then ecamera (wide angle)
@@ -168,117 +372,147 @@ class SegmentScanner(QThread):
 
                 # Use PyAV to read first frame
                 try:
-                    container = av.open(str(video_path))
-                    stream = container.streams.video[0]
-
-                    # Read only first frame
-                    for frame in container.decode(stream):
-                        # Convert to RGB
-                        img = frame.to_ndarray(format='rgb24')
-                        height, width, channel = img.shape
-
-                        # Convert to QImage
-                        bytes_per_line = 3 * width
-                        q_img = QImage(bytes(img.data), width, height, bytes_per_line, QImage.Format.Format_RGB888)
-
-                        # Scale to thumbnail (width 320 px, consistent with segment_importer)
-                        pixmap = QPixmap.fromImage(q_img)
-                        thumbnail = pixmap.scaledToWidth(320, Qt.TransformationMode.SmoothTransformation)
-
-                        # Save to file
-                        thumbnail.save(str(thumbnail_path), 'JPEG', 85)
-                        logger.info(f"Generated thumbnail: {thumbnail_path.name}")
-
-                        container.close()
-                        # Return display-sized small thumbnail (width 100 px)
-                        return thumbnail.scaledToWidth(100, Qt.TransformationMode.SmoothTransformation)
-
-                    container.close()
+                    # Decoded straight to thumbnail size (width 320 px, consistent with segment_importer)
+                    img = self._read_first_keyframe(video_path, 320)
+                    if img is None:
+                        continue
+
+                    height, width, channel = img.shape
+
+                    # Convert to QImage
+                    bytes_per_line = 3 * width
+                    thumbnail = QImage(bytes(img.data), width, height, bytes_per_line, QImage.Format.Format_RGB888)
+
+                    # Save to file
+                    if not thumbnail.save(str(thumbnail_path), 'JPEG', 85):
+                        logger.warning(f"Failed to save thumbnail: {thumbnail_path}")
+                        return False
+                    logger.info(f"Generated thumbnail: {thumbnail_path.name}")
+                    return True
                 except Exception as e:
                     logger.debug(f"Failed to read {video_file}: {e}")
                     continue
 
-            return None
+            return False
 
         except Exception as e:
             logger.debug(f"Error generating thumbnail: {e}")
+            return False
+
+    @classmethod
+    def _get_hwaccel(cls):
+        """Hardware decoding settings for av.open, None to decode in software"""
+        if not cls._hwaccel_probed:
+            cls._hwaccel_probed = True
+            if HWACCEL_AVAILABLE:
+                available = set(hwdevices_available())
+                cls._hwaccel_device_type = next(
+                    (device for device in _HWACCEL_DEVICE_TYPES if device in available), None
+                )
+        if cls._hwaccel_device_type is None:
             return None
+        return HWAccel(device_type=cls._hwaccel_device_type, allow_software_fallback=True)
 
-    def _get_video_thumbnail(self, segment_dir: Path) -> Optional[QPixmap]:
+    def _read_first_keyframe(self, video_path: Path, width: int):
         """
-        Read first frame of video as thumbnail
+        Decode the first keyframe of a video as an RGB array
+
+        Uses hardware decoding when available; if the device can't be
+        opened, hardware decoding is turned off for the rest of the session
+        and the frame is decoded in software.
 
         Args:
-            segment_dir: Segment directory path
+            video_path: Video file path
+            width: Output width; the frame is scaled (aspect ratio kept) by
+                   libswscale while converting to RGB
 
         Returns:
-            QPixmap thumbnail, None if failed
+            (height, width, 3) uint8 array, None if the video has no frames
         """
+        hwaccel = self._get_hwaccel()
         try:
-            # Try fcamera (front view) first, then ecamera (wide angle)
-            video_files = ['fcamera.hevc', 'ecamera.hevc']
-
-            for video_file in video_files:
-                video_path = segment_dir / video_file
-                if not video_path.exists():
-                    continue
+            container = av.open(str(video_path), hwaccel=hwaccel) if hwaccel else av.open(str(video_path))
+        except Exception as e:
+            if hwaccel is None:
+                raise
+            logger.info(f"Hardware video decoding ({self._hwaccel_device_type}) unavailable, using software: {e}")
+            SegmentScanner._hwaccel_device_type = None
+            container = av.open(str(video_path))
 
-                # Use PyAV to read first frame
-                try:
-                    container = av.open(str(video_path))
-                    stream = container.streams.video[0]
+        try:
+            stream = container.streams.video[0]
+            # Only keyframes are decoded: the first frame we get is the first
+            # keyframe, without reconstructing any inter-frames
+            stream.codec_context.skip_frame = 'NONKEY'
+            # Multithreaded decoding with this worker's share of the cores.
+            # Slice threading only: frame threading holds back output until
+            # several frames are queued, which costs more than it saves
+            # when a single frame is wanted
+            stream.thread_type = 'SLICE'
+            stream.codec_context.thread_count = self.decode_threads
+
+            frame = next(container.decode(stream), None)
+            if frame is None:
+                return None
 
-                    # Read only first frame
-                    for frame in container.decode(stream):
-                        # Convert to RGB
-                        img = frame.to_ndarray(format='rgb24')
-                        height, width, channel = img.shape
+            # Scale and convert to RGB in one swscale pass (hardware frames
+            # are downloaded to system memory)
+            height = max(1, round(frame.height * width / frame.width))
+            return frame.to_ndarray(width=width, height=height, format='rgb24')
+        finally:
+            container.close()
 
-                        # Convert to QImage
-                        bytes_per_line = 3 * width
-                        q_img = QImage(bytes(img.data), width, height, bytes_per_line, QImage.Format.Format_RGB888)
+    def _get_db_times(self, rlog_paths: List[str]) -> Dict:
+        """
+        Look up imported segments' times in the database
 
-                        # Scale to thumbnail (width 100 px)
-                        pixmap = QPixmap.fromImage(q_img)
-                        thumbnail = pixmap.scaledToWidth(100, Qt.TransformationMode.SmoothTransformation)
+        Returns:
+            {(route_id, segment_number): (gps_timestamp, route_timestamp)}
+        """
+        if not self.db_manager:
+            return {}
 
-                        container.close()
-                        return thumbnail
+        keys = []
+        for path in rlog_paths:
+            key = _route_segment_key(os.path.basename(os.path.dirname(path)))
+            if key:
+                keys.append(key)
 
-                    container.close()
-                except Exception as e:
-                    logger.debug(f"Failed to read {video_file}: {e}")
-                    continue
+        try:
+            return self.db_manager.get_segment_gps_times(keys)
+        except Exception as e:
+            logger.debug(f"Failed to query database: {e}")
+            return {}
 
-            return None
+    def parse_segment(self, entry: os.DirEntry, db_times: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Parse segment and get time information
 
-        except Exception as e:
-            logger.debug(f"Error generating thumbnail: {e}")
-            return None
+        Args:
+            entry: Directory entry of the rlog file (from the scandir walk)
+            db_times: Result of _get_db_times() covering this segment; looked
+                      up for this segment alone if not given
+        """
+        rlog_path = Path(entry.path)
 
-    def parse_segment(self, rlog_path: Path) -> Optional[Dict]:
-        """Parse segment and get time information"""
         # Basic information - must succeed
         try:
             # Parse directory name: 00000009--f5d34548e1--33
             dir_name = rlog_path.parent.name
-            parts = dir_name.split('--')
-            if len(parts) != 3:
+            try:
+                dir_fields = _dir_name_fields(dir_name)
+            except ValueError:
                 logger.warning(f"Invalid directory format: {dir_name}")
                 return None
 
-            segment_num = int(parts[2])
-            route_hex = parts[1]
-            dongle_id = parts[0]
-
-            # Build route_id (format: dongle_id--route_hex, consistent with segment_importer)
-            route_id = f"{dongle_id}--{route_hex}"
+            segment_num = dir_fields['segment_num']
+            route_hex = dir_fields['route_hex']
+            route_id = dir_fields['route_id']
 
-            # Get file size - critical information
+            # Get file size - critical information (DirEntry caches the stat result)
             file_size = 0
             try:
-                if rlog_path.exists():
-                    file_size = rlog_path.stat().st_size
+                file_size = entry.stat().st_size
             except Exception as e:
                 logger.error(f"Error getting file size for {rlog_path}: {e}")
 
@@ -290,68 +524,34 @@ class SegmentScanner(QThread):
         gps_time = None
         wall_time = None
 
-        if self.db_manager:
-            try:
-                # Query segment gps_timestamp from database
-                cursor = self.db_manager.conn.cursor()
-                cursor.execute("""
-                    SELECT s.gps_timestamp, r.timestamp
-                    FROM segments s
-                    JOIN routes r ON s.route_id = r.route_id
-                    WHERE s.route_id = ? AND s.segment_number = ?
-                """, (route_id, segment_num))
-                result = cursor.fetchone()
-
-                if result:
-                    # gps_timestamp is segment's own GPS time (segment start time)
-                    if result[0]:
-                        gps_time = result[0]
-                    # If no GPS time, calculate segment start time from route timestamp
-                    elif result[1]:
-                        route_start_time = result[1]
-                        gps_time = route_start_time + (segment_num * 60)
-            except Exception as e:
-                logger.debug(f"Failed to query database: {e}")
+        if db_times is None:
+            db_times = self._get_db_times([entry.path])
+        result = db_times.get((route_id, segment_num))
+
+        if result:
+            # gps_timestamp is segment's own GPS time (segment start time)
+            if result[0]:
+                gps_time = result[0]
+            # If no GPS time, calculate segment start time from route timestamp
+            elif result[1]:
+                route_start_time = result[1]
+                gps_time = route_start_time + (segment_num * 60)
 
         # Optional: If not in database, try to get GPS time from rlog
         if not gps_time:
             try:
-                with open(rlog_path, 'rb') as f:
-                    data = f.read()  # Read entire file (consistent with segment_importer)
-
-                if capnp_log and data:
-                    events = list(capnp_log.Event.read_multiple_bytes(data))
-
-                    # Find first liveLocationKalman (scan all events)
-                    for event in events:
-                        try:
-                            if event.which() == 'liveLocationKalman':
-                                llk = event.liveLocationKalman
-                                if hasattr(llk, 'unixTimestampMillis') and llk.unixTimestampMillis > 0:
-                                    # GPS time (seconds) - this is segment's GPS time
-                                    gps_time = int(llk.unixTimestampMillis / 1000)
-                                    break
-                        except:
-                            pass
-
-                    # If no GPS found, use first event's wallTimeNanos
-                    if not gps_time and events:
-                        first_event = events[0]
-                        if hasattr(first_event, 'logMonoTime'):
-                            log_time_ns = first_event.logMonoTime
-
-                            # Try to find initData to get wallTimeNanos
-                            for event in events[:100]:
-                                if event.which() == 'initData':
-                                    init_data = event.initData
-                                    if hasattr(init_data, 'wallTimeNanos'):
-                                        wall_time_ns = init_data.wallTimeNanos
-                                        if wall_time_ns > 0:
-                                            # Calculate time offset
-                                            offset = wall_time_ns - log_time_ns
-                                            # Segment first event's wallTime
-                                            wall_time = int((log_time_ns + offset) / 1e9)
-                                            break
+                if capnp_log:
+                    init_wall_time = None
+                    if file_size:
+                        # Map the file instead of reading it into memory; capnp
+                        # decodes events straight from the mapped pages
+                        with open(rlog_path, 'rb') as f, \
+                                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            gps_time, init_wall_time = _read_rlog_times(mm)
+
+                    # If no GPS found, use initData's wall time
+                    if not gps_time:
+                        wall_time = init_wall_time
 
             except Exception as e:
                 logger.debug(f"Error reading segment time: {e}")
@@ -363,23 +563,15 @@ class SegmentScanner(QThread):
             except:
                 pass
 
-        # Load or generate thumbnail
-        thumbnail = None
+        # Find or generate thumbnail file (the image itself is loaded by the dialog)
         thumbnail_filename = f"thumbnail_{segment_num}.jpg"
         thumbnail_file = rlog_path.parent / thumbnail_filename
 
-        if thumbnail_file.exists():
-            # Directly load existing thumbnail file
-            try:
-                thumbnail = QPixmap(str(thumbnail_file))
-                if thumbnail.isNull():
-                    thumbnail = None
-            except Exception as e:
-                logger.debug(f"Failed to load thumbnail {thumbnail_file}: {e}")
-                thumbnail = None
+        # If no thumbnail file, generate from video and save
+        if thumbnail_file.exists() or self._generate_and_save_thumbnail(rlog_path.parent, thumbnail_file):
+            thumbnail_path = str(thumbnail_file)
         else:
-            # If no thumbnail file, generate from video and save
-            thumbnail = self._generate_and_save_thumbnail(rlog_path.parent, thumbnail_file)
+            thumbnail_path = None
 
         # Return segment info - guaranteed to have basic fields
         return {
@@ -387,16 +579,24 @@ class SegmentScanner(QThread):
             'dir_name': dir_name,
             'segment_num': segment_num,
             'route_hex': route_hex,
+            'route_id': route_id,
+            'dongle_id': dir_fields['dongle_id'],
             'gps_time': gps_time,
             'wall_time': wall_time,
             'file_size': file_size,
-            'thumbnail': thumbnail  # QPixmap or None
+            'thumbnail_path': thumbnail_path  # JPEG path or None
         }
 
 
 class SegmentSelectorDialog(QDialog):
     """Segment selector dialog - Display actual recording time"""
 
+    # Found segments are buffered and added to the table at most once per frame
+    ADD_BATCH_INTERVAL_MS = 16
+
+    # QPixmapCache limit (KB) so scaled thumbnails survive rescans of large directories
+    THUMBNAIL_CACHE_KB = 102400
+
     def __init__(self, parent=None, default_dir: str = None, db_manager=None, translation_manager=None):
         super().__init__(parent)
         self.selected_segments: List[str] = []
@@ -405,6 +605,17 @@ class SegmentSelectorDialog(QDialog):
         self.translation_manager = translation_manager
         self.scanner_thread = None
 
+        # Segments received from the scanner but not yet in the table
+        self._pending: List[Dict] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.ADD_BATCH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
+
+        # The pixmap cache is application-wide: only ever raise its limit
+        if QPixmapCache.cacheLimit() < self.THUMBNAIL_CACHE_KB:
+            QPixmapCache.setCacheLimit(self.THUMBNAIL_CACHE_KB)
+
         t = self.translation_manager.t if self.translation_manager else lambda x: x
 
         self.setWindowTitle(t("Select Segments to Import"))
@@ -537,7 +748,9 @@ class SegmentSelectorDialog(QDialog):
         # Disable sorting while inserting data to prevent row index mismatch
         self.table.setSortingEnabled(False)
 
-        # Clear table
+        # Clear table (and rows still waiting from the previous scan)
+        self._flush_timer.stop()
+        self._pending.clear()
         self.table.setRowCount(0)
         self.status_label.setText(t("Scanning..."))
         self.progress_bar.setVisible(True)
@@ -545,31 +758,52 @@ class SegmentSelectorDialog(QDialog):
 
         # Start new scan
         self.scanner_thread = SegmentScanner(self.default_dir, self.db_manager)
-        self.scanner_thread.segment_found.connect(self.add_segment)
+        self.scanner_thread.segment_found.connect(self._queue_segment)
         self.scanner_thread.scan_finished.connect(self.scan_finished)
         self.scanner_thread.cache_loaded.connect(self.cache_loaded)
         self.scanner_thread.start()
 
-    def add_segment(self, segment_info: Dict):
-        """Add a segment to table"""
+    def _queue_segment(self, segment_info: Dict):
+        """Buffer a found segment; the batch is added when the timer fires"""
+        self._pending.append(segment_info)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        """Add all buffered segments with repainting and sorting suspended"""
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        sorting = self.table.isSortingEnabled()
+        self.table.setUpdatesEnabled(False)
+        self.table.setSortingEnabled(False)
+        try:
+            # Grow the table once for the whole batch, then fill rows by index
+            first_row = self.table.rowCount()
+            self.table.setRowCount(first_row + len(batch))
+            for row, segment_info in enumerate(batch, first_row):
+                self.add_segment(segment_info, row)
+        finally:
+            self.table.setSortingEnabled(sorting)
+            self.table.setUpdatesEnabled(True)
+
+    def add_segment(self, segment_info: Dict, row: Optional[int] = None):
+        """Add a segment to table (into an existing empty row if given)"""
         try:
             t = self.translation_manager.t if self.translation_manager else lambda x: x
 
-            row = self.table.rowCount()
-            self.table.insertRow(row)
+            if row is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
 
             # Column 0: Preview image
             try:
-                if segment_info.get('thumbnail'):
-                    # Use QLabel to display thumbnail with scaling
+                thumbnail = self._load_thumbnail(segment_info.get('thumbnail_path'))
+                if thumbnail is not None:
+                    # Use QLabel to display thumbnail
                     thumbnail_label = QLabel()
-                    # Scale thumbnail to fit display (keep aspect ratio)
-                    scaled_pixmap = segment_info['thumbnail'].scaled(
-                        120, 70,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    thumbnail_label.setPixmap(scaled_pixmap)
+                    thumbnail_label.setPixmap(thumbnail)
                     thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
                     self.table.setCellWidget(row, 0, thumbnail_label)
                     # Set row height to accommodate thumbnail
@@ -598,19 +832,16 @@ class SegmentSelectorDialog(QDialog):
                 logger.error(f"Error setting segment number for row {row}: {e}")
 
             # Column 3: GPS time (display this segment's actual start time)
+            # Display strings are preformatted by the scanner; raw values go in UserRole
             try:
-                if segment_info.get('gps_time'):
-                    try:
-                        # gps_time is already the segment's start time, display directly
-                        gps_str = datetime.fromtimestamp(segment_info.get('gps_time')).strftime('%Y-%m-%d %H:%M:%S')
-                        gps_item = QTableWidgetItem(gps_str)
-                        gps_item.setBackground(QColor(200, 255, 200))  # Light green background
-                    except:
-                        gps_item = QTableWidgetItem(t("No GPS"))
-                        gps_item.setForeground(QColor(150, 150, 150))
+                gps_str = segment_info.get('gps_time_str')
+                if gps_str:
+                    gps_item = NumericItem(gps_str)
+                    gps_item.setBackground(QColor(200, 255, 200))  # Light green background
                 else:
-                    gps_item = QTableWidgetItem(t("No GPS"))
+                    gps_item = NumericItem(t("No GPS"))
                     gps_item.setForeground(QColor(150, 150, 150))
+                gps_item.setData(Qt.ItemDataRole.UserRole, segment_info.get('gps_time'))
                 gps_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 self.table.setItem(row, 3, gps_item)
             except Exception as e:
@@ -619,16 +850,17 @@ class SegmentSelectorDialog(QDialog):
             # Column 4: Wall time (only display when no GPS)
             try:
                 if segment_info.get('wall_time') and not segment_info.get('gps_time'):
-                    try:
-                        wall_str = datetime.fromtimestamp(segment_info['wall_time']).strftime('%Y-%m-%d %H:%M:%S')
-                        wall_item = QTableWidgetItem(wall_str)
+                    wall_str = segment_info.get('wall_time_str')
+                    if wall_str:
+                        wall_item = NumericItem(wall_str)
                         wall_item.setBackground(QColor(255, 255, 200))  # Light yellow background
-                    except:
-                        wall_item = QTableWidgetItem(t("No Time"))
+                    else:
+                        wall_item = NumericItem(t("No Time"))
                         wall_item.setForeground(QColor(150, 150, 150))
                 else:
-                    wall_item = QTableWidgetItem("--")
+                    wall_item = NumericItem("--")
                     wall_item.setForeground(QColor(200, 200, 200))
+                wall_item.setData(Qt.ItemDataRole.UserRole, segment_info.get('wall_time'))
                 wall_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 self.table.setItem(row, 4, wall_item)
             except Exception as e:
@@ -636,9 +868,8 @@ class SegmentSelectorDialog(QDialog):
 
             # Column 5: File size
             try:
-                file_size = segment_info.get('file_size', 0)
-                size_mb = file_size / (1024 * 1024)
-                size_item = QTableWidgetItem(f"{size_mb:.1f} MB")
+                size_item = NumericItem(segment_info.get('size_str', ''))
+                size_item.setData(Qt.ItemDataRole.UserRole, segment_info.get('file_size', 0))
                 size_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
                 self.table.setItem(row, 5, size_item)
             except Exception as e:
@@ -654,6 +885,35 @@ class SegmentSelectorDialog(QDialog):
         except Exception as e:
             logger.error(f"Error adding segment to table: {e}", exc_info=True)
 
+    @staticmethod
+    def _load_thumbnail(thumbnail_path: Optional[str]) -> Optional[QPixmap]:
+        """
+        Load a thumbnail file at display size (fits 120x70, aspect ratio kept)
+
+        The JPEG is decoded directly at the reduced size (QImageReader scaled
+        size), so the full thumbnail is never decoded or held in memory.
+        Scaled pixmaps are kept in QPixmapCache, so rescans skip the decode.
+        """
+        if not thumbnail_path:
+            return None
+
+        cache_key = f"{thumbnail_path}:thumb120"
+        pixmap = QPixmapCache.find(cache_key)
+        if pixmap is not None:
+            return pixmap
+
+        reader = QImageReader(thumbnail_path)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(120, 70, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            logger.debug(f"Failed to load thumbnail {thumbnail_path}: {reader.errorString()}")
+            return None
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(cache_key, pixmap)
+        return pixmap
+
     def cache_loaded(self, count: int):
         """Cache loaded"""
         t = self.translation_manager.t if self.translation_manager else lambda x: x
@@ -663,6 +923,10 @@ class SegmentSelectorDialog(QDialog):
         """Scan finished"""
         t = self.translation_manager.t if self.translation_manager else lambda x: x
 
+        # Add any segments still buffered before sorting
+        self._flush_timer.stop()
+        self._flush_pending()
+
         self.progress_bar.setVisible(False)
         self.status_label.setText(t("Found {0} Segments").format(count))
 
@@ -10,22 +10,151 @@ Integrated features:
 """
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QTabWidget, QWidget,
-    QTableWidget, QTableWidgetItem, QPushButton, QLineEdit, QLabel,
+    QTableWidget, QTableWidgetItem, QTableView, QPushButton, QLineEdit, QLabel,
     QMessageBox, QHeaderView, QGroupBox, QSplitter, QFileDialog,
     QTextEdit, QScrollArea, QCheckBox
 )
-from PyQt6.QtCore import Qt, QSettings
+from PyQt6.QtCore import Qt, QSettings, QTimer, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PyQt6.QtGui import QFont
 import logging
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+class SignalTableModel(QAbstractTableModel):
+    """Table model over signal definition rows as fetched from SQLite
+
+    Each row is a tuple (signal_id, column 0, column 1, ...); cells are served
+    on demand, so loading a table costs one fetchall instead of one item per
+    cell. Edits are kept in pending_edits (signal_id -> {column: text}) until
+    saved.
+    """
+
+    # Joins a row's cells in its search text; can't be typed, so a query never
+    # matches across two cells
+    SEARCH_SEPARATOR = '\x00'
+
+    def __init__(self, headers: List[str], editable_cols, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.editable_cols = frozenset(editable_cols)
+        self.rows: List[tuple] = []
+        self.pending_edits: Dict[int, Dict[int, str]] = {}
+        self.search_text: List[str] = []  # Lowercased cell text per row, for filtering
+
+    def set_rows(self, rows: List[tuple]):
+        """Replace all rows (discards unsaved edits)"""
+        self.beginResetModel()
+        self.rows = rows
+        self.pending_edits = {}
+        self.search_text = [self._row_search_text(row) for row in rows]
+        self.endResetModel()
+
+    def _row_search_text(self, row: tuple, edits: Dict[int, str] = None) -> str:
+        cells = ['' if value is None else str(value) for value in row[1:]]
+        if edits:
+            for col, value in edits.items():
+                cells[col] = value
+        return self.SEARCH_SEPARATOR.join(cells).lower()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        row = self.rows[index.row()]
+        col = index.column()
+        edits = self.pending_edits.get(row[0])
+        if edits and col in edits:
+            return edits[col]
+        value = row[col + 1]
+        return '' if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        if index.column() in self.editable_cols:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or index.column() not in self.editable_cols:
+            return False
+        row = self.rows[index.row()]
+        edits = self.pending_edits.setdefault(row[0], {})
+        edits[index.column()] = value
+        self.search_text[index.row()] = self._row_search_text(row, edits)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def edited_rows(self) -> List[Tuple[int, List[str]]]:
+        """(signal_id, stripped text of every editable column) for edited rows"""
+        editable_cols = sorted(self.editable_cols)
+        result = []
+        for row in self.rows:
+            edits = self.pending_edits.get(row[0])
+            if not edits:
+                continue
+            values = []
+            for col in editable_cols:
+                value = edits[col] if col in edits else row[col + 1]
+                values.append((value or '').strip())
+            result.append((row[0], values))
+        return result
+
+    def clear_pending_edits(self):
+        """Fold saved edits into the rows"""
+        if not self.pending_edits:
+            return
+        for i, row in enumerate(self.rows):
+            edits = self.pending_edits.get(row[0])
+            if edits:
+                values = list(row)
+                for col, value in edits.items():
+                    values[col + 1] = value.strip() or None
+                self.rows[i] = tuple(values)
+        self.pending_edits = {}
+
+
+class SignalFilterProxyModel(QSortFilterProxyModel):
+    """Case-insensitive substring filter over a SignalTableModel's search text"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ''
+
+    def set_filter_text(self, text: str):
+        """Show only rows where some column contains text"""
+        needle = text.lower()
+        if needle != self._needle:
+            self._needle = needle
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self._needle in self.sourceModel().search_text[source_row]
+
+
 class SignalAndDatabaseManagerDialog(QDialog):
     """Signal and Database Manager Dialog"""
 
+    # Search filters are applied once typing pauses for this long
+    FILTER_DELAY_MS = 80
+
+    # Rows sampled when sizing ResizeToContents columns of the signal tables
+    # (Qt's default of 1000 makes showing a large table slow)
+    RESIZE_PRECISION_ROWS = 200
+
     def __init__(self, db_manager, parent=None, translation_manager=None):
         super().__init__(parent)
         self.db_manager = db_manager
@@ -36,9 +165,22 @@ class SignalAndDatabaseManagerDialog(QDialog):
         settings = QSettings('OpenpilotLogViewer', 'SignalTranslationEditor')
         self.show_deprecated = settings.value('show_deprecated', False, type=bool)
 
-        t = self.translation_manager.t if self.translation_manager else lambda x: x
-
-        self.setWindowTitle(t("Signal && Database Manager"))
+        # Debounce timers for the search boxes
+        self._cereal_filter_timer = QTimer(self)
+        self._cereal_filter_timer.setSingleShot(True)
+        self._cereal_filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._cereal_filter_timer.timeout.connect(
+            lambda: self.filter_cereal_table(self.cereal_search_edit.text()))
+        self._can_filter_timer = QTimer(self)
+        self._can_filter_timer.setSingleShot(True)
+        self._can_filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._can_filter_timer.timeout.connect(
+            lambda: self.filter_can_table(self.can_search_edit.text()))
+
+        # Translation function, bound once for every setup_* method
+        self.t = self.translation_manager.t if self.translation_manager else lambda x: x
+
+        self.setWindowTitle(self.t("Signal && Database Manager"))
         self.setGeometry(50, 50, 1400, 900)
 
         self.setup_ui()
@@ -46,8 +188,6 @@ class SignalAndDatabaseManagerDialog(QDialog):
 
     def setup_ui(self):
         """Setup user interface"""
-        t = self.translation_manager.t if self.translation_manager else lambda x: x
-
         layout = QVBoxLayout()
 
         # Tab widget
@@ -74,7 +214,7 @@ class SignalAndDatabaseManagerDialog(QDialog):
         button_layout = QHBoxLayout()
         button_layout.addStretch()
 
-        close_btn = QPushButton(t("Close"))
+        close_btn = QPushButton(self.t("Close"))
         close_btn.clicked.connect(self.close)
         button_layout.addWidget(close_btn)
 
@@ -86,21 +226,19 @@ class SignalAndDatabaseManagerDialog(QDialog):
     # ========================================================================
     def setup_cereal_tab(self):
         """Setup Cereal signal translation tab"""
-        t = self.translation_manager.t if self.translation_manager else lambda x: x
-
         cereal_widget = QWidget()
         cereal_layout = QVBoxLayout()
 
         # Search box and options
         search_layout = QHBoxLayout()
-        search_layout.addWidget(QLabel(t("Search:")))
+        search_layout.addWidget(QLabel(self.t("Search:")))
         self.cereal_search_edit = QLineEdit()
-        self.cereal_search_edit.setPlaceholderText(t("Enter signal name, message type, unit or translation..."))
-        self.cereal_search_edit.textChanged.connect(self.filter_cereal_table)
+        self.cereal_search_edit.setPlaceholderText(self.t("Enter signal name, message type, unit or translation..."))
+        self.cereal_search_edit.textChanged.connect(self._cereal_filter_timer.start)
         search_layout.addWidget(self.cereal_search_edit)
 
         # DEPRECATED display option
-        self.cereal_show_deprecated_checkbox = QCheckBox(t("Show DEPRECATED signals"))
+        self.cereal_show_deprecated_checkbox = QCheckBox(self.t("Show DEPRECATED signals"))
         self.cereal_show_deprecated_checkbox.setChecked(self.show_deprecated)
         self.cereal_show_deprecated_checkbox.toggled.connect(self.on_cereal_show_deprecated_toggled)
 
@@ -137,57 +275,60 @@ class SignalAndDatabaseManagerDialog(QDialog):
 
         cereal_layout.addLayout(search_layout)
 
-        # Table
-        self.cereal_table = QTableWidget()
-        self.cereal_table.setColumnCount(6)
-        self.cereal_table.setHorizontalHeaderLabels([
-            t("Message Type"), t("Full Name"), t("Data Type"), t("Unit (EN)"), t("Unit (CN)"), t("Chinese Translation")
-        ])
+        # Table (unit, Chinese unit and Chinese name are editable)
+        self.cereal_model = SignalTableModel([
+            self.t("Message Type"), self.t("Full Name"), self.t("Data Type"), self.t("Unit (EN)"), self.t("Unit (CN)"), self.t("Chinese Translation")
+        ], editable_cols=(3, 4, 5), parent=self)
+        self.cereal_proxy = SignalFilterProxyModel(self)
+        self.cereal_proxy.setSourceModel(self.cereal_model)
+        self.cereal_table = QTableView()
+        self.cereal_table.setModel(self.cereal_proxy)
         self.cereal_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.cereal_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.cereal_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         self.cereal_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         self.cereal_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
         self.cereal_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        self.cereal_table.horizontalHeader().setResizeContentsPrecision(self.RESIZE_PRECISION_ROWS)
         self.cereal_table.setAlternatingRowColors(True)
         cereal_layout.addWidget(self.cereal_table)
 
         # Buttons
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
-        self.cereal_save_btn = QPushButton(t("Save Translations"))
+        self.cereal_save_btn = QPushButton(self.t("Save Translations"))
         self.cereal_save_btn.clicked.connect(self.save_cereal_translations)
         btn_layout.addWidget(self.cereal_save_btn)
         cereal_layout.addLayout(btn_layout)
 
         cereal_widget.setLayout(cereal_layout)
-        self.tab_widget.addTab(cereal_widget, t("Cereal Signal Translation"))
+        self.tab_widget.addTab(cereal_widget, self.t("Cereal Signal Translation"))
 
     # ========================================================================
     # Tab 2: CAN Signal Translation
     # ========================================================================
     def setup_can_tab(self):
         """Setup CAN signal translation tab"""
-        t = self.translation_manager.t if self.translation_manager else lambda x: x
-
         can_widget = QWidget()
         can_layout = QVBoxLayout()
 
         # Search box
         search_layout = QHBoxLayout()
-        search_layout.addWidget(QLabel(t("Search:")))
+        search_layout.addWidget(QLabel(self.t("Search:")))
         self.can_search_edit = QLineEdit()
-        self.can_search_edit.setPlaceholderText(t("Enter signal name, CAN ID, unit or translation..."))
-        self.can_search_edit.textChanged.connect(self.filter_can_table)
+        self.can_search_edit.setPlaceholderText(self.t("Enter signal name, CAN ID, unit or translation..."))
+        self.can_search_edit.textChanged.connect(self._can_filter_timer.start)
         search_layout.addWidget(self.can_search_edit)
         can_layout.addLayout(search_layout)
 
-        # Table
-        self.can_table = QTableWidget()
-        self.can_table.setColumnCount(7)
-        self.can_table.setHorizontalHeaderLabels([
-            t("Bus ID"), t("Message Name"), t("Full Name"), t("Signal Name"), t("Unit (EN)"), t("Unit (CN)"), t("Chinese Translation")
-        ])
+        # Table (unit, Chinese unit and Chinese name are editable)
+        self.can_model = SignalTableModel([
+            self.t("Bus ID"), self.t("Message Name"), self.t("Full Name"), self.t("Signal Name"), self.t("Unit (EN)"), self.t("Unit (CN)"), self.t("Chinese Translation")
+        ], editable_cols=(4, 5, 6), parent=self)
+        self.can_proxy = SignalFilterProxyModel(self)
+        self.can_proxy.setSourceModel(self.can_model)
+        self.can_table = QTableView()
+        self.can_table.setModel(self.can_proxy)
         self.can_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.can_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.can_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
@@ -195,19 +336,20 @@ class SignalAndDatabaseManagerDialog(QDialog):
         self.can_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
         self.can_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
         self.can_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
+        self.can_table.horizontalHeader().setResizeContentsPrecision(self.RESIZE_PRECISION_ROWS)
         self.can_table.setAlternatingRowColors(True)
         can_layout.addWidget(self.can_table)
 
         # Buttons
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
-        self.can_save_btn = QPushButton(t("Save Translations"))
+        self.can_save_btn = QPushButton(self.t("Save Translations"))
         self.can_save_btn.clicked.connect(self.save_can_translations)
         btn_layout.addWidget(self.can_save_btn)
         can_layout.addLayout(btn_layout)
 
         can_widget.setLayout(can_layout)
-        self.tab_widget.addTab(can_widget, t("CAN Signal Translation"))
+        self.tab_widget.addTab(can_widget, self.t("CAN Signal Translation"))
 
     # ========================================================================
     # Tab 3: Cereal Signal Management
@@ -369,8 +511,6 @@ class SignalAndDatabaseManagerDialog(QDialog):
     # ========================================================================
     def setup_database_tab(self):
         """Setup database management tab (SQLite version)"""
-        t = self.translation_manager.t if self.translation_manager else lambda x: x
-
         db_widget = QWidget()
         db_layout = QVBoxLayout()
 
@@ -378,23 +518,23 @@ class SignalAndDatabaseManagerDialog(QDialog):
         splitter = QSplitter(Qt.Orientation.Vertical)
 
         # Top section: Database information
-        top_widget = QGroupBox(t("Database Info"))
+        top_widget = QGroupBox(self.t("Database Info"))
         top_layout = QVBoxLayout()
 
         # Database file information
         info_layout = QGridLayout()
 
-        info_layout.addWidget(QLabel(t("Database Path:")), 0, 0)
+        info_layout.addWidget(QLabel(self.t("Database Path:")), 0, 0)
         self.db_path_label = QLabel("N/A")
         self.db_path_label.setStyleSheet("color: #666;")
         info_layout.addWidget(self.db_path_label, 0, 1)
 
-        info_layout.addWidget(QLabel(t("Database Size:")), 1, 0)
+        info_layout.addWidget(QLabel(self.t("Database Size:")), 1, 0)
         self.db_size_label = QLabel("N/A")
         self.db_size_label.setStyleSheet("color: #666;")
         info_layout.addWidget(self.db_size_label, 1, 1)
 
-        info_layout.addWidget(QLabel(t("Table Count:")), 2, 0)
+        info_layout.addWidget(QLabel(self.t("Table Count:")), 2, 0)
         self.table_count_label = QLabel("N/A")
         self.table_count_label.setStyleSheet("color: #666;")
         info_layout.addWidget(self.table_count_label, 2, 1)
@@ -404,11 +544,11 @@ class SignalAndDatabaseManagerDialog(QDialog):
         # Database operation buttons
         db_ops_layout = QHBoxLayout()
 
-        self.refresh_db_info_btn = QPushButton(t("Refresh"))
+        self.refresh_db_info_btn = QPushButton(self.t("Refresh"))
         self.refresh_db_info_btn.clicked.connect(self.refresh_database_info)
         db_ops_layout.addWidget(self.refresh_db_info_btn)
 
-        self.vacuum_btn = QPushButton(t("Vacuum Database"))
+        self.vacuum_btn = QPushButton(self.t("Vacuum Database"))
         self.vacuum_btn.clicked.connect(self.vacuum_database)
         db_ops_layout.addWidget(self.vacuum_btn)
 
@@ -418,13 +558,13 @@ class SignalAndDatabaseManagerDialog(QDialog):
         top_widget.setLayout(top_layout)
 
         # Bottom section: Table list and operations
-        bottom_widget = QGroupBox(t("Table Statistics"))
+        bottom_widget = QGroupBox(self.t("Table Statistics"))
         bottom_layout = QVBoxLayout()
 
         # Refresh button
         refresh_layout = QHBoxLayout()
         refresh_layout.addStretch()
-        self.refresh_btn = QPushButton(t("Refresh"))
+        self.refresh_btn = QPushButton(self.t("Refresh"))
         self.refresh_btn.clicked.connect(self.refresh_table_list)
         refresh_layout.addWidget(self.refresh_btn)
         bottom_layout.addLayout(refresh_layout)
@@ -465,26 +605,42 @@ class SignalAndDatabaseManagerDialog(QDialog):
 
         db_layout.addWidget(splitter)
         db_widget.setLayout(db_layout)
-        self.tab_widget.addTab(db_widget, t("Database Management"))
+        self.tab_widget.addTab(db_widget, self.t("Database Management"))
 
     # ========================================================================
     # Data Loading
     # ========================================================================
     def load_data(self):
-        """Load data"""
-        # Load signal translation data
-        self.load_cereal_signals()
-        self.load_can_signals()
+        """Load data (each tab is populated the first time it is shown)"""
+        # Loaders in tab order: Cereal translation, CAN translation, database management
+        self._tab_loaders = [self.load_cereal_signals, self.load_can_signals, self.load_database_tab]
+        self._tab_loaded = [False] * self.tab_widget.count()
+        self.tab_widget.currentChanged.connect(self._ensure_tab_loaded)
 
         # Don't load Cereal/DBC management data (tabs removed)
         # self.load_cereal_info()     # Removed
         # self.load_dbc_info()        # Removed
 
-        # Load database information (SQLite version)
+        if self.isVisible():
+            self._ensure_tab_loaded(self.tab_widget.currentIndex())
+
+    def load_database_tab(self):
+        """Load database information (SQLite version)"""
         if self.db_manager and self.db_manager.conn:
             self.refresh_database_info()
             self.refresh_table_list()
 
+    def _ensure_tab_loaded(self, index: int):
+        """Populate a tab on its first display"""
+        if 0 <= index < len(self._tab_loaded) and not self._tab_loaded[index]:
+            self._tab_loaded[index] = True
+            self._tab_loaders[index]()
+
+    def showEvent(self, event):
+        """Load the initially visible tab"""
+        super().showEvent(event)
+        self._ensure_tab_loaded(self.tab_widget.currentIndex())
+
     def on_cereal_show_deprecated_toggled(self, checked: bool):
         """Show/hide DEPRECATED signals"""
         self.show_deprecated = checked
@@ -504,7 +660,8 @@ class SignalAndDatabaseManagerDialog(QDialog):
         try:
             cursor = self.db_manager.conn.cursor()
 
-            # Filter DEPRECATED signals based on option
+            # Filter DEPRECATED signals based on option (is_deprecated is an
+            # indexed generated column, already in sort order)
             if self.show_deprecated:
                 cursor.execute("""
                     SELECT signal_id, message_type, full_name, data_type, unit, unit_cn, name_cn
@@ -515,40 +672,12 @@ class SignalAndDatabaseManagerDialog(QDialog):
                 cursor.execute("""
                     SELECT signal_id, message_type, full_name, data_type, unit, unit_cn, name_cn
                     FROM cereal_signal_definitions
-                    WHERE full_name NOT LIKE '%DEPRECATED%'
+                    WHERE is_deprecated = 0
                     ORDER BY message_type, full_name
                 """)
 
             rows = cursor.fetchall()
-            self.cereal_table.setRowCount(len(rows))
-
-            for row_idx, row_data in enumerate(rows):
-                signal_id, message_type, full_name, data_type, unit, unit_cn, name_cn = row_data
-
-                # Store ID
-                id_item = QTableWidgetItem(message_type or '')
-                id_item.setData(Qt.ItemDataRole.UserRole, signal_id)
-                id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.cereal_table.setItem(row_idx, 0, id_item)
-
-                # Full signal name
-                name_item = QTableWidgetItem(full_name or '')
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.cereal_table.setItem(row_idx, 1, name_item)
-
-                # Data type
-                type_item = QTableWidgetItem(data_type or '')
-                type_item.setFlags(type_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.cereal_table.setItem(row_idx, 2, type_item)
-
-                # Unit (editable)
-                self.cereal_table.setItem(row_idx, 3, QTableWidgetItem(unit or ''))
-
-                # Chinese unit (editable)
-                self.cereal_table.setItem(row_idx, 4, QTableWidgetItem(unit_cn or ''))
-
-                # Chinese name (editable)
-                self.cereal_table.setItem(row_idx, 5, QTableWidgetItem(name_cn or ''))
+            self.cereal_model.set_rows(rows)
 
             logger.info(f"Loaded {len(rows)} Cereal signals")
 
@@ -563,47 +692,17 @@ class SignalAndDatabaseManagerDialog(QDialog):
 
         try:
             cursor = self.db_manager.conn.cursor()
+            # CAN ID is formatted as hex by SQLite
             cursor.execute("""
-                SELECT signal_id, can_id, message_name_cn, full_name, signal_name, unit, unit_cn, signal_name_cn
+                SELECT signal_id,
+                       CASE WHEN can_id IS NULL THEN '' ELSE printf('0x%03X', can_id) END,
+                       message_name_cn, full_name, signal_name, unit, unit_cn, signal_name_cn
                 FROM can_signal_definitions
                 ORDER BY can_id, full_name
             """)
 
             rows = cursor.fetchall()
-            self.can_table.setRowCount(len(rows))
-
-            for row_idx, row_data in enumerate(rows):
-                signal_id, can_id, message_name_cn, full_name, signal_name, unit, unit_cn, signal_name_cn = row_data
-
-                # CAN ID
-                id_item = QTableWidgetItem(f"0x{can_id:03X}" if can_id is not None else '')
-                id_item.setData(Qt.ItemDataRole.UserRole, signal_id)
-                id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.can_table.setItem(row_idx, 0, id_item)
-
-                # Message name
-                msg_item = QTableWidgetItem(message_name_cn or '')
-                msg_item.setFlags(msg_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.can_table.setItem(row_idx, 1, msg_item)
-
-                # Full signal name
-                full_name_item = QTableWidgetItem(full_name or '')
-                full_name_item.setFlags(full_name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.can_table.setItem(row_idx, 2, full_name_item)
-
-                # Signal name
-                sig_name_item = QTableWidgetItem(signal_name or '')
-                sig_name_item.setFlags(sig_name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.can_table.setItem(row_idx, 3, sig_name_item)
-
-                # Unit (editable)
-                self.can_table.setItem(row_idx, 4, QTableWidgetItem(unit or ''))
-
-                # Chinese unit (editable)
-                self.can_table.setItem(row_idx, 5, QTableWidgetItem(unit_cn or ''))
-
-                # Chinese name (editable)
-                self.can_table.setItem(row_idx, 6, QTableWidgetItem(signal_name_cn or ''))
+            self.can_model.set_rows(rows)
 
             logger.info(f"Loaded {len(rows)} CAN signals")
 
@@ -684,27 +783,11 @@ class SignalAndDatabaseManagerDialog(QDialog):
     # ========================================================================
     def filter_cereal_table(self, text: str):
         """Filter Cereal table"""
-        text = text.lower()
-        for row in range(self.cereal_table.rowCount()):
-            show = False
-            for col in range(self.cereal_table.columnCount()):
-                item = self.cereal_table.item(row, col)
-                if item and text in item.text().lower():
-                    show = True
-                    break
-            self.cereal_table.setRowHidden(row, not show)
+        self.cereal_proxy.set_filter_text(text)
 
     def filter_can_table(self, text: str):
         """Filter CAN table"""
-        text = text.lower()
-        for row in range(self.can_table.rowCount()):
-            show = False
-            for col in range(self.can_table.columnCount()):
-                item = self.can_table.item(row, col)
-                if item and text in item.text().lower():
-                    show = True
-                    break
-            self.can_table.setRowHidden(row, not show)
+        self.can_proxy.set_filter_text(text)
 
     # ========================================================================
     # Save Translations
@@ -718,12 +801,8 @@ class SignalAndDatabaseManagerDialog(QDialog):
             cursor = self.db_manager.conn.cursor()
             update_count = 0
 
-            for row in range(self.cereal_table.rowCount()):
-                signal_id = self.cereal_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                unit = self.cereal_table.item(row, 3).text().strip()
-                unit_cn = self.cereal_table.item(row, 4).text().strip()
-                name_cn = self.cereal_table.item(row, 5).text().strip()
-
+            # Only rows edited since loading (or the last save) are written
+            for signal_id, (unit, unit_cn, name_cn) in self.cereal_model.edited_rows():
                 cursor.execute("""
                     UPDATE cereal_signal_definitions
                     SET unit = ?, unit_cn = ?, name_cn = ?, updated_at = CURRENT_TIMESTAMP
@@ -737,6 +816,7 @@ class SignalAndDatabaseManagerDialog(QDialog):
                 update_count += 1
 
             self.db_manager.conn.commit()
+            self.cereal_model.clear_pending_edits()
 
             QMessageBox.information(
                 self,
@@ -759,12 +839,8 @@ class SignalAndDatabaseManagerDialog(QDialog):
             cursor = self.db_manager.conn.cursor()
             update_count = 0
 
-            for row in range(self.can_table.rowCount()):
-                signal_id = self.can_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                unit = self.can_table.item(row, 4).text().strip()
-                unit_cn = self.can_table.item(row, 5).text().strip()
-                signal_name_cn = self.can_table.item(row, 6).text().strip()
-
+            # Only rows edited since loading (or the last save) are written
+            for signal_id, (unit, unit_cn, signal_name_cn) in self.can_model.edited_rows():
                 cursor.execute("""
                     UPDATE can_signal_definitions
                     SET unit = ?, unit_cn = ?, signal_name_cn = ?, updated_at = CURRENT_TIMESTAMP
@@ -778,6 +854,7 @@ class SignalAndDatabaseManagerDialog(QDialog):
                 update_count += 1
 
             self.db_manager.conn.commit()
+            self.can_model.clear_pending_edits()
 
             QMessageBox.information(
                 self,
@@ -6,7 +6,7 @@ import sys
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
-    QMenuBar, QMenu, QStatusBar, QMessageBox, QDialog
+    QMenuBar, QMenu, QStatusBar, QMessageBox, QDialog, QProgressDialog, QApplication
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSettings
 from PyQt6.QtGui import QAction, QKeySequence, QShortcut
@@ -106,8 +106,21 @@ class MainWindow(QMainWindow):
             if not self.db_manager.connect():
                 raise Exception(t("Unable to connect to SQLite database"))
 
-            # Ensure tables exist
-            self.db_manager.create_tables()
+            # Ensure tables exist (an older database may first need a one-time index build)
+            progress = None
+            if self.db_manager.timeseries_index_pending():
+                progress = QProgressDialog(t("Upgrading database indexes (one-time, may take a few minutes)..."),
+                                           None, 0, 0, self)
+                progress.setWindowTitle(t("Database Upgrade"))
+                progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+                progress.setMinimumDuration(0)
+                progress.show()
+                QApplication.processEvents()
+            try:
+                self.db_manager.create_tables()
+            finally:
+                if progress is not None:
+                    progress.close()
             logger.info("SQLite database connection established")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+編譯 UI 翻譯檔工具
+Compile UI Translation Catalogs
+
+將 i18n/<code>.json 轉為 i18n/_<code>.py（TRANSLATIONS 字典常值），
+並預先產生 hash 驗證的 .pyc，讓 TranslationManager 以 marshal 載入，
+不必在每次啟動時解析 JSON。
+
+產生的模組記錄 JSON 的修改時間（st_mtime_ns）和大小，JSON 被修改後會自動改回
+解析 JSON，因此發布後仍可直接編輯 i18n/*.json。複製到發布目錄時須保留檔案的
+修改時間（xcopy 預設即會保留），否則會改為解析 JSON。
+
+用法:
+    python tools/compile_translations.py
+"""
+import sys
+import json
+import logging
+import importlib.util
+import py_compile
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def compile_catalog(json_file: Path) -> Path:
+    """
+    編譯單一翻譯檔
+
+    Args:
+        json_file: 翻譯 JSON 檔路徑
+
+    Returns:
+        Path: 產生的 Python 模組路徑
+    """
+    stat = json_file.stat()
+    translations = json.loads(json_file.read_bytes())
+    module_file = json_file.with_name(f"_{json_file.stem}.py")
+
+    lines = [
+        "# -*- coding: utf-8 -*-",
+        f"# 由 tools/compile_translations.py 從 {json_file.name} 自動產生，請勿手動修改",
+        f"SOURCE_MTIME_NS = {stat.st_mtime_ns!r}",
+        f"SOURCE_SIZE = {stat.st_size!r}",
+        "TRANSLATIONS = {",
+    ]
+    lines.extend(f"    {key!r}: {value!r}," for key, value in translations.items())
+    lines.append("}")
+    module_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    # CHECKED_HASH：.pyc 以原始碼內容驗證，複製到發布目錄後 mtime 改變仍有效
+    py_compile.compile(
+        str(module_file),
+        cfile=importlib.util.cache_from_source(str(module_file)),
+        doraise=True,
+        invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+    )
+
+    logger.info(f"✓ {json_file.name} -> {module_file.name} ({len(translations)} translations)")
+    return module_file
+
+
+def main():
+    """主函數"""
+    i18n_dir = Path(__file__).parent.parent / 'i18n'
+    json_files = sorted(i18n_dir.glob('*.json'))
+
+    if not json_files:
+        logger.warning(f"No translation catalogs found in {i18n_dir}")
+        return 1
+
+    for json_file in json_files:
+        try:
+            compile_catalog(json_file)
+        except Exception as e:
+            logger.error(f"✗ Failed to compile {json_file}: {e}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())